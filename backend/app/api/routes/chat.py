@@ -3,17 +3,29 @@ Chat API endpoint for subtitle editing via natural language.
 """
 
 from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Dict, Any
 from pathlib import Path
+import asyncio
+import hashlib
+import json
+
+# Encode SSE payloads with orjson when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from app.config import settings
 from app.models.schemas import (
     ChatRequest,
     ChatResponse,
-    ChatMessage,
-    MessageType,
     Subtitle,
-    ErrorResponse
+    VideoSession,
+    ErrorResponse,
+    SUBTITLE_LIST_ADAPTER,
+    CHAT_MESSAGE_LIST_ADAPTER
 )
 from app.services.llm_service import llm_service
 from app.utils.session import session_manager
@@ -21,6 +33,65 @@ from app.utils.session import session_manager
 
 router = APIRouter()
 
+# In-flight chat turns keyed by (session_id, message hash), so concurrent
+# duplicates (e.g. a double-clicked send) share one LLM run
+_inflight: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+
+
+async def _process_message_coalesced(
+    session_id: str,
+    message: str,
+    session: VideoSession
+) -> Dict[str, Any]:
+    """Run a chat turn, joining an identical turn already in progress."""
+    key = f"{session_id}:{hashlib.blake2b(message.encode(), digest_size=16).hexdigest()}"
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            llm_service.process_message(session_id=session_id, user_message=message, session=session)
+        )
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # Shield so one caller disconnecting doesn't cancel the turn for the others
+    return await asyncio.shield(task)
+
+
+def _validate_chat_request(request: ChatRequest):
+    """Validate the session and LLM configuration for a chat request."""
+    # Validate session exists
+    session = session_manager.get_session(request.session_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session {request.session_id} not found or expired. Please upload a video first."
+        )
+
+    # Check if LLM is configured
+    if settings.llm_provider == "openai" and not settings.openai_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="OpenAI API key not configured. Please set OPENAI_API_KEY in .env file."
+        )
+    elif settings.llm_provider == "anthropic" and not settings.anthropic_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Anthropic API key not configured. Please set ANTHROPIC_API_KEY in .env file."
+        )
+
+    return session
+
+
+def _sse_event(data: dict, event: Optional[str] = None) -> str:
+    """Format a Server-Sent Events frame."""
+    frame = f"event: {event}\n" if event else ""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, default=str).decode()
+    else:
+        payload = json.dumps(data, default=str)
+    return frame + f"data: {payload}\n\n"
+
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_ai(request: ChatRequest):
@@ -60,32 +131,11 @@ async def chat_with_ai(request: ChatRequest):
              -d '{"session_id": "sess_abc123", "message": "Add subtitle Hello from 0 to 5 seconds"}'
         ```
     """
-    # Validate session exists
-    session = session_manager.get_session(request.session_id)
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Session {request.session_id} not found or expired. Please upload a video first."
-        )
-
-    # Check if LLM is configured
-    if settings.llm_provider == "openai" and not settings.openai_api_key:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="OpenAI API key not configured. Please set OPENAI_API_KEY in .env file."
-        )
-    elif settings.llm_provider == "anthropic" and not settings.anthropic_api_key:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Anthropic API key not configured. Please set ANTHROPIC_API_KEY in .env file."
-        )
+    session = _validate_chat_request(request)
 
     # Process message through LLM service
     try:
-        result = await llm_service.process_message(
-            session_id=request.session_id,
-            user_message=request.message
-        )
+        result = await _process_message_coalesced(request.session_id, request.message, session)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -99,15 +149,11 @@ async def chat_with_ai(request: ChatRequest):
             detail=result["error"]
         )
 
-    # Convert subtitle dicts to Subtitle objects
-    subtitles = [Subtitle(**sub) for sub in result["subtitles"]]
+    # Subtitle objects straight from the session (serialized once, by the response)
+    subtitles = result["subtitles"]
 
-    # Create AI message
-    ai_message = ChatMessage(
-        type=MessageType.AI,
-        content=result["ai_response"],
-        metadata=result.get("extracted_params")
-    )
+    # AI message as saved to the chat history
+    ai_message = result["message"]
 
     # Get video URL for preview (use Path for cross-platform compatibility)
     video_filename = Path(session.video_path).name
@@ -121,6 +167,69 @@ async def chat_with_ai(request: ChatRequest):
     )
 
 
+@router.post("/chat/stream")
+async def stream_chat_with_ai(request: ChatRequest):
+    """
+    Send a chat message and stream the AI response over Server-Sent Events.
+
+    Emits ``event: status`` frames (``{"phase": ..., "status": ...}``) as
+    each workflow step starts, ``data: {"delta": ...}`` frames with response
+    text as it becomes available, then a terminal ``event: done`` frame with
+    the same payload as ``POST /chat`` (message, subtitles and preview_url).
+    Failures are reported as an ``event: error`` frame.
+
+    Example:
+        ```bash
+        curl -N -X POST "http://localhost:8000/api/chat/stream" \\
+             -H "Content-Type: application/json" \\
+             -d '{"session_id": "sess_abc123", "message": "Add subtitle Hello from 0 to 5 seconds"}'
+        ```
+    """
+    session = _validate_chat_request(request)
+    video_url = f"/uploads/{Path(session.video_path).name}"
+
+    async def event_stream():
+        # Flush headers and a first frame immediately so the client (and any
+        # buffering proxy) sees the stream open before the LLM call finishes
+        yield ": accepted\n\n"
+        try:
+            async for kind, payload in llm_service.astream_message(
+                session_id=request.session_id,
+                user_message=request.message,
+                session=session
+            ):
+                if kind == "status":
+                    yield _sse_event(payload, event="status")
+                    continue
+                if kind == "delta":
+                    yield _sse_event({"delta": payload})
+                    continue
+
+                result = payload
+                if "error" in result:
+                    yield _sse_event({"detail": result["error"]}, event="error")
+                    return
+
+                ai_message = result["message"]
+                yield _sse_event(
+                    {
+                        "session_id": request.session_id,
+                        "message": ai_message.model_dump(mode="json"),
+                        "subtitles": SUBTITLE_LIST_ADAPTER.dump_python(result["subtitles"], mode="json"),
+                        "preview_url": video_url
+                    },
+                    event="done"
+                )
+        except Exception as e:
+            yield _sse_event({"detail": f"Failed to process message: {str(e)}"}, event="error")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/chat/history/{session_id}")
 async def get_chat_history(session_id: str):
     """
@@ -149,7 +258,7 @@ async def get_chat_history(session_id: str):
 
     return {
         "session_id": session_id,
-        "messages": [msg.model_dump() for msg in chat_history],
+        "messages": CHAT_MESSAGE_LIST_ADAPTER.dump_python(chat_history),
         "count": len(chat_history)
     }
 
@@ -3,14 +3,18 @@ Export API endpoint for burning subtitles into video.
 """
 
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 from pathlib import Path
+import asyncio
+import stat
 import uuid
 
 from app.config import settings
-from app.models.schemas import ExportRequest, ExportResponse
+from app.models.schemas import ExportRequest, ExportResponse, JobResponse
 from app.services.video_service import video_service, VideoProcessingError
 from app.services.subtitle_service import subtitle_service
+from app.services.job_queue import job_queue, Job
+from app.api.routes.media import MediaFileResponse
 from app.utils.session import session_manager
 from app.utils.helpers import sanitize_filename
 
@@ -18,23 +22,24 @@ from app.utils.helpers import sanitize_filename
 router = APIRouter()
 
 
-@router.post("/export", response_model=ExportResponse)
+@router.post("/export", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def export_video(request: ExportRequest):
     """
     Export video with burned-in subtitles.
 
-    This endpoint:
+    This endpoint queues a background job that:
     1. Generates an SRT/ASS subtitle file from current subtitles
     2. Burns the subtitles into the video using FFmpeg
-    3. Returns a download URL for the final video
+    3. Stores an ExportResponse (with download URL) as the job result
 
-    **Note**: This process can take some time depending on video length and quality settings.
+    The request returns immediately; poll `GET /api/jobs/{job_id}` until the
+    job status is `completed` or `failed`.
 
     Args:
         request: ExportRequest with session_id and optional filename
 
     Returns:
-        ExportResponse with download URL
+        JobResponse for the queued export job
 
     Example:
         ```bash
@@ -86,50 +91,87 @@ async def export_video(request: ExportRequest):
     subtitle_filename = f"{unique_id}_subtitles.ass"
     subtitle_path = settings.temp_dir / subtitle_filename
 
-    try:
-        # Get video resolution for ASS subtitle generation
-        width, height = video_service.get_resolution(video_path)
-
-        # Generate ASS subtitle file
-        subtitle_service.generate_ass(
-            subtitles=session.subtitles,
-            output_path=subtitle_path,
-            video_width=width,
-            video_height=height
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to generate subtitle file: {str(e)}"
+    # Snapshot subtitles so later chat edits don't change a queued export
+    subtitles = list(session.subtitles)
+    duration = session.metadata.duration
+
+    # Video resolution for ASS subtitle generation (probed at upload)
+    width, height = session.metadata.width, session.metadata.height
+
+    async def run_export(job: Job) -> dict:
+        try:
+            # Generate ASS subtitle file
+            await asyncio.to_thread(
+                subtitle_service.generate_ass,
+                subtitles=subtitles,
+                output_path=subtitle_path,
+                video_width=width,
+                video_height=height
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate subtitle file: {str(e)}")
+
+        # Burn subtitles into video
+        try:
+            await video_service.burn_subtitles_async(
+                video_path=video_path,
+                subtitle_path=subtitle_path,
+                output_path=output_path,
+                duration=duration,
+                progress_callback=job.set_progress
+            )
+        except VideoProcessingError as e:
+            raise RuntimeError(f"Failed to burn subtitles: {str(e)}")
+        finally:
+            # Clean up temporary subtitle file
+            subtitle_path.unlink(missing_ok=True)
+
+        # Record export so status lookups don't need to scan the output directory
+        session_manager.add_export(
+            request.session_id,
+            final_output_filename,
+            output_path.stat().st_size
         )
 
-    # Burn subtitles into video
-    try:
-        video_service.burn_subtitles(
-            video_path=video_path,
-            subtitle_path=subtitle_path,
-            output_path=output_path
-        )
-    except VideoProcessingError as e:
-        # Clean up subtitle file
-        subtitle_path.unlink(missing_ok=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to burn subtitles: {str(e)}"
-        )
+        # Generate download URL
+        download_url = f"/outputs/{final_output_filename}"
 
-    # Clean up temporary subtitle file
-    subtitle_path.unlink(missing_ok=True)
+        return ExportResponse(
+            session_id=request.session_id,
+            download_url=download_url,
+            filename=output_filename,
+            message="Video exported successfully with subtitles"
+        ).model_dump()
 
-    # Generate download URL
-    download_url = f"/outputs/{final_output_filename}"
+    job = job_queue.submit("export", request.session_id, run_export)
 
-    return ExportResponse(
-        session_id=request.session_id,
-        download_url=download_url,
-        filename=output_filename,
-        message="Video exported successfully with subtitles"
-    )
+    return JobResponse(**job.to_dict())
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job_status(job_id: str):
+    """
+    Get status and result of a background export/preview job.
+
+    Args:
+        job_id: Job ID returned when the job was queued
+
+    Returns:
+        JobResponse with status, progress and, once completed, the result
+
+    Example:
+        ```bash
+        curl "http://localhost:8000/api/jobs/job_1a2b3c4d5e6f"
+        ```
+    """
+    job = job_queue.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+
+    return JobResponse(**job.to_dict())
 
 
 @router.get("/download/{filename}")
@@ -151,37 +193,53 @@ async def download_video(filename: str):
     # Sanitize filename
     safe_filename = sanitize_filename(filename)
 
-    # Check output directory
+    # Check output directory (single stat, reused by the response)
     file_path = settings.output_dir / safe_filename
 
-    if not file_path.exists():
+    try:
+        stat_result = file_path.stat()
+    except OSError:
+        stat_result = None
+
+    if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found"
         )
 
+    headers = {
+        "Content-Disposition": f'attachment; filename="{safe_filename}"'
+    }
+
+    # Behind nginx: let nginx stream the file from its internal location
+    if settings.use_x_accel_redirect:
+        headers["X-Accel-Redirect"] = f"{settings.x_accel_outputs_location.rstrip('/')}/{safe_filename}"
+        return Response(media_type="video/mp4", headers=headers)
+
     # Return file for download
-    return FileResponse(
+    return MediaFileResponse(
         path=str(file_path),
         filename=safe_filename,
         media_type="video/mp4",
-        headers={
-            "Content-Disposition": f'attachment; filename="{safe_filename}"'
-        }
+        stat_result=stat_result,
+        headers=headers
     )
 
 
-@router.post("/preview/{session_id}")
+@router.post("/preview/{session_id}", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def generate_preview(session_id: str, duration: int = 10):
     """
-    Generate a preview clip with subtitles (first N seconds).
+    Queue generation of a preview clip (first N seconds).
+
+    Poll `GET /api/jobs/{job_id}`; the completed job result contains the
+    preview URL.
 
     Args:
         session_id: Session ID
         duration: Preview duration in seconds (default: 10)
 
     Returns:
-        Preview video URL
+        JobResponse for the queued preview job
 
     Example:
         ```bash
@@ -208,26 +266,28 @@ async def generate_preview(session_id: str, duration: int = 10):
     preview_filename = f"{session_id}_preview.mp4"
     preview_path = settings.temp_dir / preview_filename
 
-    try:
-        # Create preview clip
-        video_service.create_preview_clip(
-            video_path=video_path,
-            output_path=preview_path,
-            start_time=0.0,
-            duration=float(duration)
-        )
-    except VideoProcessingError as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to generate preview: {str(e)}"
-        )
+    async def run_preview(job: Job) -> dict:
+        try:
+            # Create preview clip
+            await video_service.create_preview_clip_async(
+                video_path=video_path,
+                output_path=preview_path,
+                start_time=0.0,
+                duration=float(duration)
+            )
+        except VideoProcessingError as e:
+            raise RuntimeError(f"Failed to generate preview: {str(e)}")
+
+        return {
+            "session_id": session_id,
+            "preview_url": f"/temp/{preview_filename}",
+            "duration": duration,
+            "message": "Preview generated successfully"
+        }
 
-    return {
-        "session_id": session_id,
-        "preview_url": f"/temp/{preview_filename}",
-        "duration": duration,
-        "message": "Preview generated successfully"
-    }
+    job = job_queue.submit("preview", session_id, run_preview)
+
+    return JobResponse(**job.to_dict())
 
 
 @router.get("/export/status/{session_id}")
@@ -254,17 +314,8 @@ async def get_export_status(session_id: str):
             detail=f"Session {session_id} not found"
         )
 
-    # Check for existing exports
-    output_files = list(settings.output_dir.glob(f"*{session_id}*"))
-
-    exports = [
-        {
-            "filename": f.name,
-            "size": f.stat().st_size,
-            "download_url": f"/outputs/{f.name}"
-        }
-        for f in output_files
-    ]
+    # Existing exports recorded at export time
+    exports = session_manager.get_exports(session_id)
 
     return {
         "session_id": session_id,
@@ -0,0 +1,105 @@
+"""
+Media file serving for uploaded, exported and temporary videos.
+Replaces per-directory StaticFiles mounts with one route per directory
+that reuses a single stat and streams in large chunks.
+"""
+
+from email.utils import parsedate
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import FileResponse, Response
+from pathlib import Path
+import stat
+
+from app.config import settings
+
+
+router = APIRouter()
+
+# URL prefix -> directory served under it
+MEDIA_DIRECTORIES = {
+    "uploads": settings.upload_dir,
+    "outputs": settings.output_dir,
+    "temp": settings.temp_dir,
+}
+
+
+class MediaFileResponse(FileResponse):
+    """
+    FileResponse reading 1MB chunks instead of Starlette's 64KB default.
+    Starlette handles Range/If-Range headers (206 Partial Content) for video seeking.
+    """
+    chunk_size = 1024 * 1024
+
+
+def _is_not_modified(response_headers, request_headers) -> bool:
+    """Check conditional request headers against the file's ETag/Last-Modified."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match:
+        etag = response_headers["etag"]
+        return etag in [tag.strip(" W/") for tag in if_none_match.split(",")]
+
+    if_modified_since = parsedate(request_headers.get("if-modified-since", ""))
+    last_modified = parsedate(response_headers["last-modified"])
+    return bool(if_modified_since and last_modified and if_modified_since >= last_modified)
+
+
+def serve_media_file(directory: Path, file_path: str, request: Request) -> Response:
+    """
+    Serve a file from a media directory.
+
+    Args:
+        directory: Directory the file must be inside
+        file_path: Path relative to the directory
+        request: Incoming request (for conditional headers)
+
+    Returns:
+        File response, or 304 Not Modified
+
+    Raises:
+        HTTPException: If the file does not exist or is outside the directory
+    """
+    root = directory.resolve()
+    full_path = (root / file_path).resolve()
+
+    # Reject traversal outside the media directory
+    if not full_path.is_relative_to(root):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    try:
+        stat_result = full_path.stat()
+    except OSError:
+        stat_result = None
+
+    if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    response = MediaFileResponse(str(full_path), stat_result=stat_result)
+
+    if _is_not_modified(response.headers, request.headers):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={
+                name: value for name, value in response.headers.items()
+                if name in ("cache-control", "content-location", "date", "etag", "expires", "vary")
+            }
+        )
+
+    return response
+
+
+def _add_media_route(prefix: str, directory: Path) -> None:
+    """Register GET/HEAD /{prefix}/{file_path} serving files from directory."""
+    async def serve(file_path: str, request: Request):
+        return serve_media_file(directory, file_path, request)
+
+    router.add_api_route(
+        f"/{prefix}/{{file_path:path}}",
+        serve,
+        methods=["GET", "HEAD"],
+        name=prefix,
+        include_in_schema=False
+    )
+
+
+for _prefix, _directory in MEDIA_DIRECTORIES.items():
+    _add_media_route(_prefix, _directory)
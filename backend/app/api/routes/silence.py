@@ -4,12 +4,18 @@ Silence Detection and Removal Routes
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-import os
+import asyncio
 import logging
+import numpy as np
 from typing import Optional, List
 from pathlib import Path
 
-from app.services.silence_remover_service import SilenceRemoverService
+from app.services.silence_remover_service import (
+    SilenceSegment,
+    get_silence_remover_service,
+    detect_silence_cached,
+)
+from app.models.schemas import SUBTITLE_LIST_ADAPTER
 from app.utils.session import session_manager
 from app.config import settings
 
@@ -35,10 +41,33 @@ class RemoveSilenceResponse(BaseModel):
     subtitles: Optional[List] = []
 
 
+def removed_segments(keep_segments, total_duration):
+    """
+    Get the spans that were cut out, given the segments that were kept
+
+    Args:
+        keep_segments: (start, end) tuples of the input that were kept
+        total_duration: Total duration of the input video
+
+    Returns:
+        List of SilenceSegment objects for the removed spans
+    """
+    removed = []
+    previous_end = 0.0
+    for start, end in list(keep_segments) + [(total_duration, total_duration)]:
+        if start > previous_end:
+            removed.append(SilenceSegment(previous_end, start, start - previous_end))
+        previous_end = max(previous_end, end)
+    return removed
+
+
 def adjust_subtitle_timestamps(subtitles, silence_segments):
     """
     Adjust subtitle timestamps after silence removal
 
+    Uses cumulative silence durations and a binary search per timestamp,
+    so the cost is O((N + M) log M) for N subtitles and M silent segments.
+
     Args:
         subtitles: List of Subtitle objects
         silence_segments: List of SilenceSegment objects that were removed
@@ -49,29 +78,26 @@ def adjust_subtitle_timestamps(subtitles, silence_segments):
     if not subtitles or not silence_segments:
         return subtitles
 
-    adjusted_subtitles = []
+    # Sort segments by end time and precompute cumulative removed durations
+    ordered = sorted(silence_segments, key=lambda seg: seg.end)
+    seg_ends = np.fromiter((seg.end for seg in ordered), dtype=float, count=len(ordered))
+    cum_removed = np.concatenate(([0.0], np.cumsum([seg.duration for seg in ordered])))
 
-    for subtitle in subtitles:
-        # Calculate how much silence was removed before start_time
-        time_removed_before_start = sum(
-            seg.duration for seg in silence_segments
-            if seg.end <= subtitle.start_time
-        )
+    starts = np.fromiter((sub.start_time for sub in subtitles), dtype=float, count=len(subtitles))
+    ends = np.fromiter((sub.end_time for sub in subtitles), dtype=float, count=len(subtitles))
 
-        # Calculate how much silence was removed before end_time
-        time_removed_before_end = sum(
-            seg.duration for seg in silence_segments
-            if seg.end <= subtitle.end_time
-        )
+    # Silence removed before a time = sum of durations of segments ending at or before it
+    new_starts = starts - cum_removed[np.searchsorted(seg_ends, starts, side="right")]
+    new_ends = ends - cum_removed[np.searchsorted(seg_ends, ends, side="right")]
 
-        # Adjust timestamps
-        new_start = subtitle.start_time - time_removed_before_start
-        new_end = subtitle.end_time - time_removed_before_end
+    # Only keep subtitles that are still valid (not within removed silence)
+    keep = (new_starts >= 0) & (new_ends > new_starts)
 
-        # Only include subtitle if it's still valid (not within removed silence)
-        if new_start >= 0 and new_end > new_start:
-            subtitle.start_time = round(new_start, 2)
-            subtitle.end_time = round(new_end, 2)
+    adjusted_subtitles = []
+    for subtitle, new_start, new_end, is_valid in zip(subtitles, new_starts, new_ends, keep):
+        if is_valid:
+            subtitle.start_time = round(float(new_start), 2)
+            subtitle.end_time = round(float(new_end), 2)
             adjusted_subtitles.append(subtitle)
 
     return adjusted_subtitles
@@ -95,19 +121,28 @@ async def remove_silence(request: RemoveSilenceRequest):
             raise HTTPException(status_code=404, detail="Session not found")
 
         # Get video path
-        video_path = session.video_path
-        if not video_path or not os.path.exists(video_path):
+        video_path = Path(session.video_path) if session.video_path else None
+        if video_path is None or not video_path.is_file():
             raise HTTPException(status_code=404, detail="Video not found")
 
-        # Initialize silence remover service
-        service = SilenceRemoverService(
+        # Get shared silence remover service
+        service = get_silence_remover_service(
             noise_threshold=request.noise_threshold,
             min_silence_duration=request.min_silence_duration
         )
 
-        # Detect silence
-        logger.info(f"Detecting silence in video for session {request.session_id}")
-        silence_segments, total_duration = service.detect_silence(video_path)
+        # Detect silence (reuses the upload-time result for an unchanged file)
+        if not session.metadata.has_audio:
+            logger.info(f"Video for session {request.session_id} has no audio, skipping silence detection")
+            silence_segments, total_duration = [], session.metadata.duration
+        else:
+            logger.info(f"Detecting silence in video for session {request.session_id}")
+            silence_segments, total_duration = await asyncio.to_thread(
+                detect_silence_cached,
+                str(video_path),
+                noise_threshold=request.noise_threshold,
+                min_silence_duration=request.min_silence_duration
+            )
 
         if not silence_segments:
             return RemoveSilenceResponse(
@@ -115,32 +150,38 @@ async def remove_silence(request: RemoveSilenceRequest):
                 message="No silence detected in video",
                 silence_removed=False,
                 stats={"total_silence_duration": 0, "silence_percentage": 0, "num_silent_segments": 0},
-                preview_url=f"/uploads/{os.path.basename(video_path)}",
-                subtitles=[sub.dict() for sub in session.subtitles] if session.subtitles else []
+                preview_url=f"/uploads/{video_path.name}",
+                subtitles=SUBTITLE_LIST_ADAPTER.dump_python(session.subtitles)
             )
 
         # Get stats
         stats = service.get_silence_stats(silence_segments, total_duration)
 
         # Create output path
-        filename = os.path.basename(video_path)
-        name, ext = os.path.splitext(filename)
-        output_filename = f"{name}_no_silence{ext}"
+        output_filename = f"{video_path.stem}_no_silence{video_path.suffix}"
         output_path = str(settings.upload_dir / output_filename)
 
         # Remove silence
         logger.info(f"Removing {len(silence_segments)} silent segments from video")
-        service.remove_silence(video_path, output_path, silence_segments)
+        _, kept_segments = await asyncio.to_thread(
+            service.remove_silence, str(video_path), output_path, silence_segments, total_duration
+        )
 
-        # Adjust subtitle timestamps
+        # Adjust subtitle timestamps to what was actually cut (keyframe snapping
+        # can keep slightly more than the detected non-silent parts)
         if session.subtitles:
             logger.info(f"Adjusting {len(session.subtitles)} subtitle timestamps")
-            adjusted_subtitles = adjust_subtitle_timestamps(session.subtitles, silence_segments)
+            adjusted_subtitles = adjust_subtitle_timestamps(
+                session.subtitles, removed_segments(kept_segments, total_duration)
+            )
             session.subtitles = adjusted_subtitles
             logger.info(f"Adjusted subtitles: {len(adjusted_subtitles)} remaining")
 
-        # Update session with new video path
+        # Update session with new video path; export progress is measured
+        # against the metadata duration, so it must match the cut video
         session.video_path = output_path
+        session.metadata.duration = round(sum(end - start for start, end in kept_segments), 3)
+        session.metadata.size = Path(output_path).stat().st_size
 
         logger.info(f"Successfully removed silence for session {request.session_id}")
 
@@ -150,9 +191,11 @@ async def remove_silence(request: RemoveSilenceRequest):
             silence_removed=True,
             stats=stats,
             preview_url=f"/uploads/{output_filename}",
-            subtitles=[sub.dict() for sub in session.subtitles] if session.subtitles else []
+            subtitles=SUBTITLE_LIST_ADAPTER.dump_python(session.subtitles)
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error removing silence: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to remove silence: {str(e)}")
@@ -176,19 +219,28 @@ async def detect_silence(request: RemoveSilenceRequest):
             raise HTTPException(status_code=404, detail="Session not found")
 
         # Get video path
-        video_path = session.video_path
-        if not video_path or not os.path.exists(video_path):
+        video_path = Path(session.video_path) if session.video_path else None
+        if video_path is None or not video_path.is_file():
             raise HTTPException(status_code=404, detail="Video not found")
 
-        # Initialize silence remover service
-        service = SilenceRemoverService(
+        # Get shared silence remover service
+        service = get_silence_remover_service(
             noise_threshold=request.noise_threshold,
             min_silence_duration=request.min_silence_duration
         )
 
-        # Detect silence
-        logger.info(f"Detecting silence in video for session {request.session_id}")
-        silence_segments, total_duration = service.detect_silence(video_path)
+        # Detect silence (reuses the upload-time result for an unchanged file)
+        if not session.metadata.has_audio:
+            logger.info(f"Video for session {request.session_id} has no audio, skipping silence detection")
+            silence_segments, total_duration = [], session.metadata.duration
+        else:
+            logger.info(f"Detecting silence in video for session {request.session_id}")
+            silence_segments, total_duration = await asyncio.to_thread(
+                detect_silence_cached,
+                str(video_path),
+                noise_threshold=request.noise_threshold,
+                min_silence_duration=request.min_silence_duration
+            )
 
         # Get stats
         stats = service.get_silence_stats(silence_segments, total_duration)
@@ -202,6 +254,8 @@ async def detect_silence(request: RemoveSilenceRequest):
             "stats": stats
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error detecting silence: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to detect silence: {str(e)}")
@@ -5,15 +5,25 @@ Handles video file uploads and session creation.
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, status
 from pathlib import Path
-import aiofiles
+from typing import BinaryIO, List, Optional, Tuple
+import asyncio
+import filecmp
+import os
+import threading
 import uuid
+from collections import OrderedDict
 
 from app.config import settings
-from app.models.schemas import UploadResponse, ErrorResponse
+from app.models.schemas import UploadResponse, ErrorResponse, VideoMetadata
 from app.services.video_service import video_service, VideoProcessingError
-from app.services.silence_remover_service import SilenceRemoverService
+from app.services.silence_remover_service import (
+    SilenceSegment,
+    get_silence_remover_service,
+    cache_silence_result,
+    detect_silence_cached
+)
 from app.utils.session import session_manager
-from app.utils.helpers import sanitize_filename
+from app.utils.helpers import sanitize_filename, fingerprint_file
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,6 +31,111 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Uploaded files by content fingerprint, for de-duplicating repeat uploads
+# (least recently used first; bounded so it doesn't outgrow swept uploads)
+_UPLOAD_INDEX_SIZE = 256
+_upload_index: "OrderedDict[str, Tuple[Path, VideoMetadata]]" = OrderedDict()
+_upload_index_lock = threading.Lock()
+
+# Read/write uploads in 8MB chunks to minimise syscalls on large files
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def _save_upload(src: BinaryIO, dest: Path, max_size: int) -> int:
+    """
+    Copy an uploaded file to disk, stopping once it exceeds max_size.
+
+    Args:
+        src: Uploaded file object (Starlette's spooled temporary file)
+        dest: Destination path
+        max_size: Maximum allowed size in bytes
+
+    Returns:
+        Number of bytes written (greater than max_size if the limit was hit)
+    """
+    total_size = 0
+    with open(dest, 'wb') as out_file:
+        while chunk := src.read(UPLOAD_CHUNK_SIZE):
+            total_size += len(chunk)
+            if total_size > max_size:
+                break
+            out_file.write(chunk)
+    return total_size
+
+
+def _probe_upload(
+    video_path: Path,
+    noise_threshold: str,
+    min_silence_duration: float
+) -> Tuple[VideoMetadata, Optional[List[SilenceSegment]], float]:
+    """
+    Probe an uploaded file, reusing results from an identical earlier upload.
+
+    Duplicates are detected by a head/tail fingerprint and confirmed with a
+    full byte comparison; the new file is then replaced by a hard link to
+    the existing one.
+
+    Args:
+        video_path: Path to the saved upload
+        noise_threshold: Volume threshold for silence (e.g., "-30dB")
+        min_silence_duration: Minimum duration of silence to detect (seconds)
+
+    Returns:
+        Tuple of (VideoMetadata, silence segments or None, total duration)
+    """
+    fingerprint = fingerprint_file(video_path)
+
+    with _upload_index_lock:
+        known = _upload_index.get(fingerprint)
+        if known is not None:
+            _upload_index.move_to_end(fingerprint)
+    if known is not None:
+        existing_path, existing_metadata = known
+        if existing_path.is_file() and filecmp.cmp(existing_path, video_path, shallow=False):
+            logger.info(f"Upload {video_path.name} duplicates {existing_path.name}, reusing probe results")
+            _link_duplicate(existing_path, video_path)
+            metadata = existing_metadata.model_copy(update={"filename": video_path.name})
+
+            if not metadata.has_audio:
+                return metadata, [], metadata.duration
+            try:
+                silence_segments, total_duration = detect_silence_cached(
+                    str(existing_path), noise_threshold, min_silence_duration
+                )
+            except Exception as e:
+                logger.warning(f"Failed to detect silence (non-critical): {str(e)}")
+                return metadata, None, metadata.duration
+            return metadata, silence_segments, total_duration
+
+        # Stale entry (file deleted or changed)
+        with _upload_index_lock:
+            _upload_index.pop(fingerprint, None)
+
+    metadata, silence_segments, total_duration = video_service.probe_and_detect_silence(
+        video_path,
+        noise_threshold=noise_threshold,
+        min_silence_duration=min_silence_duration
+    )
+    with _upload_index_lock:
+        _upload_index[fingerprint] = (video_path, metadata)
+        _upload_index.move_to_end(fingerprint)
+        while len(_upload_index) > _UPLOAD_INDEX_SIZE:
+            _upload_index.popitem(last=False)
+
+    return metadata, silence_segments, total_duration
+
+
+def _link_duplicate(existing_path: Path, video_path: Path) -> None:
+    """Replace a duplicate upload with a hard link to the existing file."""
+    link_path = video_path.with_name(f"{video_path.name}.link")
+    try:
+        os.link(existing_path, link_path)
+        link_path.replace(video_path)
+    except OSError as e:
+        # Hard links unsupported (e.g. across filesystems): keep the copy
+        link_path.unlink(missing_ok=True)
+        logger.debug(f"Could not hard-link duplicate upload: {str(e)}")
+
 
 @router.post("/upload", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
 async def upload_video(
@@ -63,25 +178,19 @@ async def upload_video(
     video_path = settings.upload_dir / final_filename
 
     try:
-        # Save uploaded file
-        async with aiofiles.open(video_path, 'wb') as out_file:
-            # Read and write in chunks to handle large files
-            chunk_size = 1024 * 1024  # 1MB chunks
-            total_size = 0
-
-            while content := await file.read(chunk_size):
-                total_size += len(content)
-
-                # Check file size limit
-                if total_size > settings.max_upload_size:
-                    # Remove partial file
-                    video_path.unlink(missing_ok=True)
-                    raise HTTPException(
-                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                        detail=f"File too large. Maximum size: {settings.max_upload_size / (1024*1024):.0f}MB"
-                    )
-
-                await out_file.write(content)
+        # Save uploaded file in a worker thread (large chunks, one open file)
+        total_size = await asyncio.to_thread(
+            _save_upload, file.file, video_path, settings.max_upload_size
+        )
+
+        # Check file size limit
+        if total_size > settings.max_upload_size:
+            # Remove partial file
+            video_path.unlink(missing_ok=True)
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large. Maximum size: {settings.max_upload_size / (1024*1024):.0f}MB"
+            )
 
     except HTTPException:
         raise
@@ -93,9 +202,18 @@ async def upload_video(
             detail=f"Failed to save file: {str(e)}"
         )
 
-    # Extract video metadata
+    # Extract video metadata and detect silence in a single FFmpeg pass
+    # (or reuse the results of an identical earlier upload)
+    noise_threshold = "-30dB"
+    min_silence_duration = 1.0
     try:
-        metadata = video_service.extract_metadata(video_path)
+        logger.info(f"Probing and detecting silence in uploaded video: {final_filename}")
+        metadata, silence_segments, total_duration = await asyncio.to_thread(
+            _probe_upload,
+            video_path,
+            noise_threshold=noise_threshold,
+            min_silence_duration=min_silence_duration
+        )
     except VideoProcessingError as e:
         # Clean up invalid video file
         video_path.unlink(missing_ok=True)
@@ -104,17 +222,26 @@ async def upload_video(
             detail=f"Invalid video file: {str(e)}"
         )
 
-    # Detect silence in video
+    # Summarize silence detection results
     silence_data = None
-    try:
-        logger.info(f"Detecting silence in uploaded video: {final_filename}")
-        silence_service = SilenceRemoverService(
-            noise_threshold="-30dB",
-            min_silence_duration=1.0
+    if silence_segments is None:
+        # Don't fail the upload if silence detection fails
+        logger.warning("Failed to detect silence (non-critical)")
+    else:
+        # Seed the detection cache so /remove-silence doesn't re-run FFmpeg
+        cache_silence_result(
+            str(video_path), noise_threshold, min_silence_duration, silence_segments, total_duration
         )
-        silence_segments, total_duration = silence_service.detect_silence(str(video_path))
 
-        if silence_segments:
+        if not metadata.has_audio:
+            silence_data = {
+                "has_silence": False,
+                "segments": [],
+                "stats": {"total_silence_duration": 0, "silence_percentage": 0, "num_silent_segments": 0}
+            }
+            logger.info("Video has no audio stream, skipped silence detection")
+        elif silence_segments:
+            silence_service = get_silence_remover_service(noise_threshold, min_silence_duration)
             silence_stats = silence_service.get_silence_stats(silence_segments, total_duration)
             silence_data = {
                 "has_silence": True,
@@ -129,10 +256,6 @@ async def upload_video(
                 "stats": {"total_silence_duration": 0, "silence_percentage": 0, "num_silent_segments": 0}
             }
             logger.info("No silence detected in video")
-    except Exception as e:
-        logger.warning(f"Failed to detect silence (non-critical): {str(e)}")
-        # Don't fail the upload if silence detection fails
-        silence_data = None
 
     # Create editing session
     try:
@@ -3,10 +3,15 @@ Configuration management for the AI Video Editor backend.
 Uses pydantic-settings to load environment variables.
 """
 
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
 
 
+# Backend root directory (resolved once at import)
+_BASE_DIR = Path(__file__).resolve().parent.parent
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -29,20 +34,40 @@ class Settings(BaseSettings):
     llm_provider: str = "openai"  # "openai", "anthropic", or "google"/"gemini"
     llm_model: str = "gpt-4o-mini"  # or "claude-3-5-sonnet-20241022" or "gemini-pro"
     llm_temperature: float = 0.7
+    llm_max_tokens: int = 256  # Output cap; a parsed message is well under 150 tokens
+    llm_timeout: float = 60.0  # Seconds per LLM HTTP request
+    llm_max_connections: int = 100  # Pooled connections to the LLM API
+    llm_max_keepalive_connections: int = 20
+    llm_context_subtitles: int = 20  # Most recent subtitles listed in the prompt (0 = all)
+
+    # Semantic Cache Settings
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.92  # Minimum cosine similarity for a hit
+    semantic_cache_ttl: int = 3600  # 1 hour in seconds
+    semantic_cache_max_entries: int = 512
+    semantic_cache_model: str = "sentence-transformers/all-MiniLM-L6-v2"
 
     # File Upload Settings
     max_upload_size: int = 500 * 1024 * 1024  # 500MB in bytes
     allowed_video_formats: list[str] = [".mp4", ".mov", ".avi", ".webm"]
 
     # Directory Settings
-    base_dir: Path = Path(__file__).parent.parent
-    upload_dir: Path = base_dir / "uploads"
-    output_dir: Path = base_dir / "outputs"
-    temp_dir: Path = base_dir / "temp"
+    base_dir: Path = _BASE_DIR
+    upload_dir: Path = _BASE_DIR / "uploads"
+    output_dir: Path = _BASE_DIR / "outputs"
+    temp_dir: Path = _BASE_DIR / "temp"
+
+    # Download Settings
+    use_x_accel_redirect: bool = False  # Serve downloads via nginx X-Accel-Redirect
+    x_accel_outputs_location: str = "/protected/outputs"  # nginx internal location for output_dir
 
     # Session Settings
     session_ttl: int = 3600  # 1 hour in seconds
 
+    # Generated File Cleanup Settings
+    file_ttl: int = 24 * 3600  # Delete unused uploads/exports/temp files after 24 hours
+    file_sweep_interval: int = 600  # Sweep every 10 minutes
+
     # Subtitle Default Settings
     default_font_family: str = "Arial"
     default_font_size: int = 32
@@ -52,6 +77,12 @@ class Settings(BaseSettings):
     # FFmpeg Settings
     ffmpeg_threads: int = 4
     video_quality: str = "high"  # "high", "medium", "low"
+    video_encoder: str = "auto"  # "auto" (prefer hardware), "libx264", "h264_nvenc", ...
+    vaapi_device: str = "/dev/dri/renderD128"
+
+    # Background Job Settings
+    job_workers: int = 1  # Concurrent export/preview jobs
+    job_retention: int = 3600  # Keep finished jobs for 1 hour
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -61,16 +92,33 @@ class Settings(BaseSettings):
     )
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the cached Settings instance (usable as a FastAPI dependency)."""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
+
+
+# Set once the directories exist, so lifespan restarts skip the filesystem checks
+_directories_ready = False
 
 
 # Create necessary directories on startup
 def create_directories():
     """Create upload, output, and temp directories if they don't exist."""
-    settings.upload_dir.mkdir(parents=True, exist_ok=True)
-    settings.output_dir.mkdir(parents=True, exist_ok=True)
-    settings.temp_dir.mkdir(parents=True, exist_ok=True)
+    global _directories_ready
+    if _directories_ready:
+        return
+
+    for directory in (settings.upload_dir, settings.output_dir, settings.temp_dir):
+        # One stat for existing directories instead of an always-issued mkdir
+        if not directory.is_dir():
+            directory.mkdir(parents=True, exist_ok=True)
+
+    _directories_ready = True
     print(f"✓ Created directories:")
     print(f"  - Upload: {settings.upload_dir}")
     print(f"  - Output: {settings.output_dir}")
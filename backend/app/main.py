@@ -5,18 +5,32 @@ Main FastAPI application for AI Video Editor backend.
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import logging
 import uvicorn
 
+# Serialize JSON responses with orjson when installed
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+except ImportError:
+    DefaultJSONResponse = JSONResponse
+
 from app.config import settings, create_directories
 from app.models.schemas import HealthResponse, ErrorResponse
+from app.services.job_queue import job_queue
+from app.services.file_sweeper import file_sweeper
+from app.services.llm_service import llm_service
+from app.utils.log_queue import start_queued_logging, stop_queued_logging
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
+    # Write log records from a background thread so handlers never block on stdio
+    start_queued_logging(logging.DEBUG if settings.debug else logging.INFO)
+
     print("🚀 Starting AI Video Editor API...")
     print(f"📦 Version: {settings.app_version}")
     print(f"🤖 LLM Provider: {settings.llm_provider}")
@@ -25,10 +39,24 @@ async def lifespan(app: FastAPI):
     # Create necessary directories
     create_directories()
 
+    # Start background export/preview workers
+    await job_queue.start()
+
+    # Start periodic cleanup of old exports and temp files
+    await file_sweeper.start()
+
     yield
 
     # Shutdown
     print("👋 Shutting down AI Video Editor API...")
+    await job_queue.stop()
+    await file_sweeper.stop()
+
+    # Close pooled LLM HTTP connections
+    await llm_service.aclose()
+
+    # Flush queued log records
+    stop_queued_logging()
 
 
 # Initialize FastAPI app
@@ -37,6 +65,7 @@ app = FastAPI(
     version=settings.app_version,
     description="FastAPI backend for AI-powered video editing with chat-based subtitle generation",
     lifespan=lifespan,
+    default_response_class=DefaultJSONResponse,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json"
@@ -52,29 +81,11 @@ app.add_middleware(
 )
 
 
-# Mount static files for serving videos
-app.mount(
-    "/uploads",
-    StaticFiles(directory=str(settings.upload_dir)),
-    name="uploads"
-)
-app.mount(
-    "/outputs",
-    StaticFiles(directory=str(settings.output_dir)),
-    name="outputs"
-)
-app.mount(
-    "/temp",
-    StaticFiles(directory=str(settings.temp_dir)),
-    name="temp"
-)
-
-
 # Exception handlers
 @app.exception_handler(404)
 async def not_found_handler(request: Request, exc):
     """Handle 404 errors."""
-    return JSONResponse(
+    return DefaultJSONResponse(
         status_code=404,
         content=ErrorResponse(
             error="Not Found",
@@ -87,7 +98,7 @@ async def not_found_handler(request: Request, exc):
 @app.exception_handler(500)
 async def internal_error_handler(request: Request, exc):
     """Handle 500 errors."""
-    return JSONResponse(
+    return DefaultJSONResponse(
         status_code=500,
         content=ErrorResponse(
             error="Internal Server Error",
@@ -120,13 +131,16 @@ async def health_check():
 
 
 # Import and include routers
-from app.api.routes import upload, chat, export, silence
+from app.api.routes import upload, chat, export, silence, media
 
 app.include_router(upload.router, prefix="/api", tags=["Upload"])
 app.include_router(chat.router, prefix="/api", tags=["Chat"])
 app.include_router(export.router, prefix="/api", tags=["Export"])
 app.include_router(silence.router, tags=["Silence"])
 
+# Serve uploaded, exported and temporary videos (/uploads, /outputs, /temp)
+app.include_router(media.router, tags=["Media"])
+
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -2,7 +2,7 @@
 Pydantic schemas for API request/response validation.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -23,6 +23,14 @@ class SubtitlePosition(str, Enum):
     BOTTOM = "bottom"
 
 
+class JobStatus(str, Enum):
+    """Background job status."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 # Subtitle Models
 class SubtitleStyle(BaseModel):
     """Subtitle styling configuration."""
@@ -43,9 +51,9 @@ class Subtitle(BaseModel):
     end_time: float = Field(ge=0, description="End time in seconds")
     style: SubtitleStyle = Field(description="Subtitle styling")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [{
                 "id": "sub_123",
                 "text": "Hello World",
                 "start_time": 0.0,
@@ -56,8 +64,13 @@ class Subtitle(BaseModel):
                     "font_color": "white",
                     "position": "bottom"
                 }
-            }
+            }]
         }
+    )
+
+
+# Serializes/validates whole subtitle lists in one call
+SUBTITLE_LIST_ADAPTER = TypeAdapter(List[Subtitle])
 
 
 # Video Models
@@ -70,6 +83,7 @@ class VideoMetadata(BaseModel):
     fps: float = Field(ge=1, description="Frames per second")
     format: str = Field(description="Video format/codec")
     size: int = Field(ge=0, description="File size in bytes")
+    has_audio: bool = Field(default=True, description="Whether the file has an audio stream")
 
 
 class VideoSession(BaseModel):
@@ -90,18 +104,23 @@ class ChatMessage(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(default=None, description="Additional metadata")
 
 
+# Serializes whole chat histories in one call
+CHAT_MESSAGE_LIST_ADAPTER = TypeAdapter(List[ChatMessage])
+
+
 class ChatRequest(BaseModel):
     """Request to send a chat message."""
     session_id: str = Field(description="Video session ID")
     message: str = Field(min_length=1, max_length=2000, description="User message/prompt")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [{
                 "session_id": "sess_abc123",
                 "message": "Add subtitle 'Hello World' from 0 to 5 seconds with red color"
-            }
+            }]
         }
+    )
 
 
 class ChatResponse(BaseModel):
@@ -128,9 +147,9 @@ class UploadResponse(BaseModel):
     message: str = Field(description="Success message")
     silence_detection: Optional[SilenceDetectionData] = Field(default=None, description="Silence detection results")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [{
                 "session_id": "sess_abc123",
                 "filename": "my_video.mp4",
                 "metadata": {
@@ -140,7 +159,8 @@ class UploadResponse(BaseModel):
                     "height": 1080,
                     "fps": 30.0,
                     "format": "mp4",
-                    "size": 52428800
+                    "size": 52428800,
+                    "has_audio": True
                 },
                 "message": "Video uploaded successfully",
                 "silence_detection": {
@@ -152,8 +172,9 @@ class UploadResponse(BaseModel):
                         "num_silent_segments": 1
                     }
                 }
-            }
+            }]
         }
+    )
 
 
 # Export Models
@@ -162,13 +183,14 @@ class ExportRequest(BaseModel):
     session_id: str = Field(description="Video session ID")
     filename: Optional[str] = Field(default=None, description="Output filename (optional)")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [{
                 "session_id": "sess_abc123",
                 "filename": "my_edited_video.mp4"
-            }
+            }]
         }
+    )
 
 
 class ExportResponse(BaseModel):
@@ -178,15 +200,43 @@ class ExportResponse(BaseModel):
     filename: str = Field(description="Exported filename")
     message: str = Field(description="Success message")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [{
                 "session_id": "sess_abc123",
                 "download_url": "/api/download/sess_abc123_output.mp4",
                 "filename": "my_edited_video.mp4",
                 "message": "Video exported successfully"
-            }
+            }]
+        }
+    )
+
+
+class JobResponse(BaseModel):
+    """Background job state, returned when a job is queued and when polling it."""
+    job_id: str = Field(description="Unique job ID")
+    session_id: str = Field(description="Video session ID")
+    kind: str = Field(description="Job type (export or preview)")
+    status: JobStatus = Field(description="Current job status")
+    progress: float = Field(default=0.0, ge=0, le=100, description="Progress percentage")
+    result: Optional[Dict[str, Any]] = Field(default=None, description="Job result once completed")
+    error: Optional[str] = Field(default=None, description="Error message if the job failed")
+    status_url: str = Field(description="URL to poll for job status")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [{
+                "job_id": "job_1a2b3c4d5e6f",
+                "session_id": "sess_abc123",
+                "kind": "export",
+                "status": "queued",
+                "progress": 0.0,
+                "result": None,
+                "error": None,
+                "status_url": "/api/jobs/job_1a2b3c4d5e6f"
+            }]
         }
+    )
 
 
 # Error Models
@@ -196,14 +246,15 @@ class ErrorResponse(BaseModel):
     detail: Optional[str] = Field(default=None, description="Detailed error information")
     status_code: int = Field(description="HTTP status code")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [{
                 "error": "Invalid session",
                 "detail": "Session sess_123 not found or expired",
                 "status_code": 404
-            }
+            }]
         }
+    )
 
 
 # Health Check
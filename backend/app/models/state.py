@@ -2,8 +2,9 @@
 LangGraph state definitions for the video editing workflow.
 """
 
-from typing import TypedDict, List, Optional, Dict, Any, Annotated
-from operator import add
+from typing import TypedDict, List, Optional, Dict, Any, Literal
+
+from pydantic import BaseModel, Field
 
 
 class SubtitleEdit(TypedDict, total=False):
@@ -23,7 +24,8 @@ class SubtitleEdit(TypedDict, total=False):
 class VideoEditState(TypedDict, total=False):
     """
     State for the video editing LangGraph workflow.
-    This state is passed through all nodes in the graph.
+    This state is passed through all nodes in the graph; each node returns
+    only the keys it changes.
     """
     # Session information
     session_id: str
@@ -35,24 +37,22 @@ class VideoEditState(TypedDict, total=False):
     intent: Optional[str]  # "add_subtitle", "modify_subtitle", "remove_subtitle", etc.
     extracted_params: Optional[Dict[str, Any]]
 
-    # Current subtitles (list of subtitle dicts)
-    current_subtitles: Annotated[List[Dict[str, Any]], add]
-
     # Subtitle edits to apply
     subtitle_edits: Optional[List[SubtitleEdit]]
 
     # Track modifications
     modified_index: Optional[int]
 
-    # Chat history
-    chat_history: Annotated[List[Dict[str, str]], add]
-
     # AI response
     ai_response: Optional[str]
 
     # Error handling
     error: Optional[str]
 
+    # Semantic cache
+    cache_context: Optional[int]  # Hash of subtitles the message was parsed against
+    cache_hit: bool  # Intent/parameters were restored from cache
+
     # Workflow control
     should_apply_edits: bool
     workflow_complete: bool
@@ -64,3 +64,24 @@ class LLMResponse(TypedDict):
     subtitle_edits: List[SubtitleEdit]
     response_message: str
     confidence: float
+
+
+class ParsedMessage(BaseModel):
+    """Intent and subtitle parameters extracted from a user message in one LLM call."""
+    intent: Literal[
+        "add_subtitle", "modify_subtitle", "remove_subtitle",
+        "list_subtitles", "clear_all", "help"
+    ] = Field(..., description="What the user wants to do")
+    subtitle_index: Optional[int] = Field(
+        None,
+        description="Subtitle to modify: -1 for last/previous, 0 for subtitle 1, 1 for subtitle 2, ..."
+    )
+    text: Optional[str] = Field(None, description="Subtitle text")
+    start_time: Optional[str] = Field(None, description='Start time, e.g. "5", "5 seconds", "1:30", "0:00:05"')
+    end_time: Optional[str] = Field(None, description="End time, same formats as start_time")
+    font_family: Optional[str] = Field(None, description="Font name, e.g. Arial, Helvetica, Roboto")
+    font_size: Optional[int] = Field(None, description="Font size in pixels (12-72)")
+    font_color: Optional[str] = Field(None, description="Color name or hex, e.g. red, #FF0000")
+    position: Optional[Literal["top", "center", "bottom"]] = Field(None, description="Subtitle position")
+    bold: Optional[bool] = Field(None, description="Bold text")
+    italic: Optional[bool] = Field(None, description="Italic text")
@@ -0,0 +1,102 @@
+"""
+Periodic cleanup of generated files.
+Removes old uploads, exports and temporary files so their directories stay bounded.
+"""
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+from app.config import settings
+from app.utils.session import session_manager
+
+logger = logging.getLogger(__name__)
+
+
+class FileSweeper:
+    """Background task deleting files older than a TTL."""
+
+    def __init__(self, directories: Iterable[Path], ttl: int, interval: int):
+        """
+        Initialize file sweeper
+
+        Args:
+            directories: Directories to sweep (non-recursive)
+            ttl: Maximum file age in seconds
+            interval: Seconds between sweeps
+        """
+        self.directories = list(directories)
+        self.ttl = ttl
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the sweep loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="file-sweeper")
+
+    async def stop(self) -> None:
+        """Cancel the sweep loop."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                removed = await asyncio.to_thread(self.sweep, self._referenced_files())
+                if removed:
+                    logger.info(f"Removed {len(removed)} expired files")
+            except Exception as e:
+                logger.error(f"File sweep failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def _referenced_files(self) -> Set[str]:
+        """Names of files still used by active sessions."""
+        referenced = set()
+        for session_id, session in session_manager.get_all_sessions().items():
+            referenced.update(export["filename"] for export in session_manager.get_exports(session_id))
+            referenced.add(f"{session_id}_preview.mp4")
+            if session.video_path:
+                referenced.add(Path(session.video_path).name)
+        return referenced
+
+    def sweep(self, referenced: Set[str]) -> List[Path]:
+        """
+        Delete expired files once.
+
+        Args:
+            referenced: File names to keep regardless of age
+
+        Returns:
+            List of removed paths
+        """
+        cutoff = time.time() - self.ttl
+        removed = []
+
+        for directory in self.directories:
+            if not directory.is_dir():
+                continue
+            for entry in directory.iterdir():
+                # Keep placeholders like .gitkeep and files still in use
+                if entry.name.startswith(".") or entry.name in referenced:
+                    continue
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        entry.unlink()
+                        removed.append(entry)
+                except OSError as e:
+                    logger.warning(f"Could not remove {entry}: {str(e)}")
+
+        return removed
+
+
+# Global file sweeper instance
+file_sweeper = FileSweeper(
+    directories=[settings.upload_dir, settings.output_dir, settings.temp_dir],
+    ttl=settings.file_ttl,
+    interval=settings.file_sweep_interval
+)
@@ -0,0 +1,149 @@
+"""
+Background job queue for long-running FFmpeg work.
+Export and preview requests are queued here and processed by asyncio workers,
+so HTTP requests return immediately and clients poll for completion.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.models.schemas import JobStatus
+from app.utils.helpers import generate_id
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """A queued unit of background work."""
+
+    def __init__(
+        self,
+        kind: str,
+        session_id: str,
+        handler: Callable[["Job"], Awaitable[Dict[str, Any]]]
+    ):
+        self.job_id = generate_id("job")
+        self.kind = kind
+        self.session_id = session_id
+        self.handler = handler
+        self.status = JobStatus.QUEUED
+        self.progress = 0.0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.finished_at: Optional[float] = None
+
+    def set_progress(self, percent: float) -> None:
+        """Update progress percentage (safe to call from worker threads)."""
+        self.progress = round(max(0.0, min(100.0, percent)), 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "session_id": self.session_id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "status_url": f"/api/jobs/{self.job_id}"
+        }
+
+
+class JobQueue:
+    """asyncio.Queue-backed job runner with in-memory job state."""
+
+    def __init__(self, num_workers: int = 1, retention: int = 3600):
+        """
+        Initialize job queue
+
+        Args:
+            num_workers: Number of jobs processed concurrently
+            retention: Seconds to keep finished jobs available for polling
+        """
+        self.num_workers = num_workers
+        self.retention = retention
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: Dict[str, Job] = {}
+
+    async def start(self) -> None:
+        """Start worker tasks on the running event loop."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.num_workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel worker tasks."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(
+        self,
+        kind: str,
+        session_id: str,
+        handler: Callable[[Job], Awaitable[Dict[str, Any]]]
+    ) -> Job:
+        """
+        Queue a job for background processing.
+
+        Args:
+            kind: Job type label (e.g. "export", "preview")
+            session_id: Session the job belongs to
+            handler: Coroutine function receiving the Job and returning its result
+
+        Returns:
+            The queued Job
+        """
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+
+        self._prune_finished()
+
+        job = Job(kind=kind, session_id=session_id, handler=handler)
+        self._jobs[job.job_id] = job
+        self._queue.put_nowait(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get job by ID, returns None if unknown or pruned."""
+        return self._jobs.get(job_id)
+
+    async def _worker(self) -> None:
+        """Process jobs from the queue until cancelled."""
+        while True:
+            job = await self._queue.get()
+            job.status = JobStatus.RUNNING
+            try:
+                job.result = await job.handler(job)
+                job.status = JobStatus.COMPLETED
+                job.progress = 100.0
+            except Exception as e:
+                logger.error(f"Job {job.job_id} ({job.kind}) failed: {str(e)}")
+                job.error = str(e)
+                job.status = JobStatus.FAILED
+            finally:
+                job.finished_at = time.monotonic()
+                self._queue.task_done()
+
+    def _prune_finished(self) -> None:
+        """Drop finished jobs older than the retention period."""
+        cutoff = time.monotonic() - self.retention
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# Global job queue instance
+job_queue = JobQueue(num_workers=settings.job_workers, retention=settings.job_retention)
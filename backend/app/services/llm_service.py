@@ -3,227 +3,473 @@ LLM Service with LangGraph workflow for chat-based subtitle editing.
 Orchestrates AI-powered subtitle generation and modification.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+import asyncio
+import copy
 import json
 import re
 from datetime import datetime
 
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+import httpx
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
-
-# Import Google Gemini support
-try:
-    from langchain_google_genai import ChatGoogleGenerativeAI
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+from pydantic import ValidationError
 
 from app.config import settings
-from app.models.schemas import Subtitle, SubtitleStyle, ChatMessage, MessageType
-from app.models.state import VideoEditState, SubtitleEdit, LLMResponse
+from app.models.schemas import Subtitle, SubtitleStyle, ChatMessage, MessageType, VideoSession
+from app.models.state import VideoEditState, SubtitleEdit, LLMResponse, ParsedMessage
 from app.utils.helpers import parse_time_string, generate_id, color_name_to_hex
 from app.utils.session import session_manager
+from app.services.semantic_cache import semantic_cache
+
+# Optional HTTP/2 support for the pooled LLM clients (httpx needs the h2 package)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Static system prompt for parsing intent and parameters. Kept byte-identical
+# across calls (per-turn subtitle context goes in the user message) so
+# providers can reuse the cached prompt prefix.
+_PARSE_SYSTEM_PROMPT = """You are a subtitle editing assistant. Analyze the user's message, determine their intent and extract the subtitle parameters.
+
+Possible intents:
+- add_subtitle: User wants to add a NEW subtitle (e.g., "add 'hello' at 5 seconds")
+- modify_subtitle: User wants to CHANGE an existing subtitle's text, time, or style (e.g., "make the previous subtitle red", "change the last one to blue", "make subtitle 1 bigger")
+- remove_subtitle: User wants to remove a subtitle
+- list_subtitles: User wants to see current subtitles
+- clear_all: User wants to remove all subtitles
+- help: User needs help
+
+IMPORTANT: If user mentions "previous", "last", "that", "this", or references an existing subtitle number, use "modify_subtitle".
+
+Parameters (only for add_subtitle and modify_subtitle, use null otherwise):
+- subtitle_index: Which subtitle to modify (use -1 for last/previous/most recent, 0 for "subtitle 1" or "first subtitle", 1 for "subtitle 2"). REQUIRED for modifications.
+- text: The subtitle text (REQUIRED for new subtitles; for modifications only if the user wants to change the text)
+- start_time: Start time in seconds or time format (e.g., "5 seconds", "1:30", "0:00:05")
+- end_time: End time in seconds or time format
+- font_family: Font name (e.g., Arial, Helvetica, Roboto)
+- font_size: Font size in pixels (12-72)
+- font_color: Color name or hex (e.g., red, #FF0000, white)
+- position: top, center, or bottom
+- bold: true or false (only if user mentions bold)
+- italic: true or false (only if user mentions italic)
+
+For modify_subtitle, only include parameters that the user wants to CHANGE, use null for others.
+
+Respond with a JSON object.
+Example: {"intent": "add_subtitle", "text": "Hello", "start_time": "0", "end_time": "5", "font_color": "red"}
+Example: {"intent": "modify_subtitle", "subtitle_index": -1, "font_color": "red"} for "make the previous subtitle red" """
+
+# Per-turn part of the parse prompt
+_PARSE_USER_TEMPLATE = """Current subtitles:
+{context}
+
+Message: {message}"""
+
+
+def _build_parse_prompt(provider: str) -> ChatPromptTemplate:
+    """
+    Build the parse prompt for an LLM provider.
+
+    Anthropic only caches prompt prefixes marked with cache_control, so the
+    system block gets an ephemeral breakpoint there; OpenAI and Gemini cache
+    repeated prefixes automatically.
+
+    Args:
+        provider: Configured LLM provider name
+
+    Returns:
+        Prompt template taking "context" and "message"
+    """
+    if provider == "anthropic":
+        system = SystemMessage(content=[{
+            "type": "text",
+            "text": _PARSE_SYSTEM_PROMPT,
+            "cache_control": {"type": "ephemeral"}
+        }])
+    else:
+        system = SystemMessage(content=_PARSE_SYSTEM_PROMPT)
+
+    return ChatPromptTemplate.from_messages([system, ("user", _PARSE_USER_TEMPLATE)])
+
+
+# Whole-message patterns for intents that need no parameters
+_FAST_INTENT_PATTERNS = [
+    (re.compile(r"^/?(help|what can you do|how does this work)[.!?]*$", re.IGNORECASE), "help"),
+    (re.compile(r"^(list|show)( me)?( all)?( the)?( current)? subtitles[.!?]*$", re.IGNORECASE), "list_subtitles"),
+    (re.compile(r"^(clear|remove|delete) (all( of)? )?(the )?subtitles[.!?]*$", re.IGNORECASE), "clear_all"),
+]
+
+# Plain times only ("5", "2.5s", "10 seconds", "1:30"); anything vaguer goes to the LLM
+_FAST_TIME = r"\d+(?:\.\d+)?(?::\d{1,2}(?:\.\d+)?){0,2}(?:\s*(?:s|secs?|seconds?))?"
+_FAST_COLORS = "white|black|red|green|blue|yellow|cyan|magenta|orange|purple|pink|brown|gray|grey"
+
+# "add 'Hello' from 1 to 4 seconds", "add subtitle \"Hi\" at 5s"
+_FAST_ADD_PATTERN = re.compile(
+    rf"^add(?: (?:a )?subtitle)? (?P<quote>[\"'])(?P<text>.+?)(?P=quote) "
+    rf"(?:from|at) (?P<start>{_FAST_TIME})(?: (?:to|until) (?P<end>{_FAST_TIME}))?[.!]*$",
+    re.IGNORECASE
+)
+
+# "make subtitle 2 red", "make the last one bold", "move it to the top", "make it bigger"
+_FAST_STYLE_PATTERN = re.compile(
+    r"^(?:make|change|set|turn|move) (?:subtitle (?P<number>\d+)|the (?:last|previous) (?:one|subtitle)|it)"
+    rf"(?: to)?(?: the)? (?:(?P<color>{_FAST_COLORS})|(?P<flag>bold|italic)|(?P<position>top|center|bottom)"
+    r"|(?P<size>bigger|larger|smaller))[.!]*$",
+    re.IGNORECASE
+)
+
+# Font size change for relative size words (result clamped to 12-72px)
+_FAST_SIZE_STEPS = {"bigger": 12, "larger": 12, "smaller": -12}
+
+
+def _fast_classify(message: str, subtitles: List[Subtitle]) -> Optional[ParsedMessage]:
+    """
+    Parse unambiguous messages without calling the LLM.
+
+    Covers parameter-free intents and simple add/style commands; free-form
+    requests still go to the LLM.
+
+    Args:
+        message: User chat message
+        subtitles: Session subtitles (to resolve "bigger"/"smaller")
+
+    Returns:
+        ParsedMessage, or None if the LLM should decide
+    """
+    text = " ".join(message.split())
+    for pattern, intent in _FAST_INTENT_PATTERNS:
+        if pattern.match(text):
+            return ParsedMessage(intent=intent)
+
+    match = _FAST_ADD_PATTERN.match(text)
+    if match:
+        return ParsedMessage(
+            intent="add_subtitle",
+            text=match["text"],
+            start_time=match["start"],
+            end_time=match["end"]
+        )
+
+    match = _FAST_STYLE_PATTERN.match(text)
+    if match:
+        if match["number"] is None:
+            subtitle_index = -1
+        elif int(match["number"]) >= 1:
+            subtitle_index = int(match["number"]) - 1
+        else:
+            return None
+
+        font_size = None
+        if match["size"]:
+            if not -len(subtitles) <= subtitle_index < len(subtitles):
+                return None
+            current_size = subtitles[subtitle_index].style.font_size
+            font_size = min(max(current_size + _FAST_SIZE_STEPS[match["size"].lower()], 12), 72)
+
+        flag = (match["flag"] or "").lower()
+        return ParsedMessage(
+            intent="modify_subtitle",
+            subtitle_index=subtitle_index,
+            font_size=font_size,
+            font_color=match["color"].lower() if match["color"] else None,
+            position=match["position"].lower() if match["position"] else None,
+            bold=True if flag == "bold" else None,
+            italic=True if flag == "italic" else None
+        )
+
+    return None
+
+
+def _format_subtitle_context(subtitles: List[Subtitle], limit: int) -> str:
+    """
+    Describe subtitles for the parse prompt in a single pass.
+
+    Only the last ``limit`` subtitles are listed (numbered by their real
+    position) so prompt size stays bounded for long sessions.
+
+    Args:
+        subtitles: Session subtitles
+        limit: Maximum number of subtitles to list (0 for no limit)
+
+    Returns:
+        One line per subtitle, or a placeholder when there are none
+    """
+    if not subtitles:
+        return "No subtitles yet"
+
+    omitted = max(len(subtitles) - limit, 0) if limit > 0 else 0
+    lines = "\n".join(
+        f"Subtitle {i}: \"{sub.text}\" from {sub.start_time}s to {sub.end_time}s, "
+        f"color: {sub.style.font_color}, size: {sub.style.font_size}"
+        for i, sub in enumerate(subtitles[omitted:], start=omitted + 1)
+    )
+    if omitted:
+        return f"... {omitted} earlier subtitles omitted\n{lines}"
+    return lines
+
+
+# Shared decoder for pulling JSON objects out of free-form model output
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Find the first JSON object embedded in text.
+
+    Decodes from each "{" with JSONDecoder.raw_decode, so nested objects
+    and braces inside strings are handled without regex backtracking.
+
+    Args:
+        text: Model output possibly wrapping JSON in prose or code fences
+
+    Returns:
+        Parsed dict, or None if no JSON object was found
+    """
+    start = text.find("{")
+    while start != -1:
+        try:
+            value, _ = _JSON_DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+            continue
+        if isinstance(value, dict):
+            return value
+        start = text.find("{", start + 1)
+    return None
+
+
+# Style fields a subtitle edit can set
+_STYLE_FIELDS = ("font_family", "font_size", "font_color", "position", "bold", "italic")
+
+# Style for new subtitles without overrides, built once from settings.
+# Styles are never mutated in place, so subtitles can share this instance.
+_DEFAULT_STYLE = SubtitleStyle(
+    font_family=settings.default_font_family,
+    font_size=settings.default_font_size,
+    font_color=(
+        settings.default_font_color if settings.default_font_color.startswith("#")
+        else color_name_to_hex(settings.default_font_color)
+    ),
+    position=settings.default_subtitle_position,
+    bold=False,
+    italic=False
+)
 
 
 class LLMService:
     """Service for LLM-powered subtitle editing using LangGraph."""
 
     def __init__(self):
-        self.llm = self._initialize_llm()
+        self.http_client: Optional[httpx.Client] = None
+        self.http_async_client: Optional[httpx.AsyncClient] = None
+        # Created on first chat message, so importing this module stays cheap
+        self._llm = None
+        self._parse_chain = None
         self.workflow = self._build_workflow()
 
+    @property
+    def llm(self):
+        """LLM client, initialized on first use."""
+        if self._llm is None:
+            self._llm = self._initialize_llm()
+        return self._llm
+
+    @property
+    def parse_chain(self):
+        """Prompt | structured-output LLM chain for parsing messages."""
+        if self._parse_chain is None:
+            self._parse_chain = _build_parse_prompt(settings.llm_provider) | self.llm.with_structured_output(ParsedMessage, include_raw=True)
+        return self._parse_chain
+
     def _initialize_llm(self):
-        """Initialize LLM based on configuration."""
+        """
+        Initialize LLM based on configuration.
+        Provider SDKs are imported here so only the configured one is loaded.
+        """
         if settings.llm_provider == "openai":
+            from langchain_openai import ChatOpenAI
+
+            # Long-lived pooled clients so calls reuse TCP/TLS connections
+            limits = httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections
+            )
+            # HTTP/2 multiplexes concurrent chat requests over fewer connections
+            self.http_client = httpx.Client(
+                limits=limits, timeout=settings.llm_timeout, http2=HTTP2_AVAILABLE
+            )
+            self.http_async_client = httpx.AsyncClient(
+                limits=limits, timeout=settings.llm_timeout, http2=HTTP2_AVAILABLE
+            )
             return ChatOpenAI(
                 model=settings.llm_model,
                 temperature=settings.llm_temperature,
-                api_key=settings.openai_api_key
+                max_tokens=settings.llm_max_tokens,
+                api_key=settings.openai_api_key,
+                http_client=self.http_client,
+                http_async_client=self.http_async_client
             )
         elif settings.llm_provider == "anthropic":
+            from langchain_anthropic import ChatAnthropic
+
             return ChatAnthropic(
                 model=settings.llm_model,
                 temperature=settings.llm_temperature,
+                max_tokens=settings.llm_max_tokens,
                 api_key=settings.anthropic_api_key
             )
         elif settings.llm_provider == "google" or settings.llm_provider == "gemini":
-            if not GEMINI_AVAILABLE:
+            try:
+                from langchain_google_genai import ChatGoogleGenerativeAI
+            except ImportError as e:
                 raise ValueError(
                     "Google Gemini support not available. "
                     "Install with: pip install langchain-google-genai"
-                )
+                ) from e
+
             return ChatGoogleGenerativeAI(
                 model=settings.llm_model,
                 temperature=settings.llm_temperature,
+                max_output_tokens=settings.llm_max_tokens,
                 google_api_key=settings.google_api_key
             )
         else:
             raise ValueError(f"Unsupported LLM provider: {settings.llm_provider}")
 
+    async def aclose(self) -> None:
+        """Close pooled HTTP clients."""
+        if self.http_async_client is not None:
+            await self.http_async_client.aclose()
+        if self.http_client is not None:
+            self.http_client.close()
+
     def _build_workflow(self) -> StateGraph:
         """Build LangGraph workflow for subtitle editing."""
         workflow = StateGraph(VideoEditState)
 
         # Add nodes
-        workflow.add_node("parse_intent", self._parse_intent_node)
-        workflow.add_node("extract_parameters", self._extract_parameters_node)
+        workflow.add_node("parse_message", self._parse_message_node)
         workflow.add_node("apply_edits", self._apply_edits_node)
         workflow.add_node("generate_response", self._generate_response_node)
 
         # Add edges
-        workflow.set_entry_point("parse_intent")
-        workflow.add_edge("parse_intent", "extract_parameters")
-        workflow.add_edge("extract_parameters", "apply_edits")
+        workflow.set_entry_point("parse_message")
+        workflow.add_conditional_edges(
+            "parse_message",
+            self._route_after_parse,
+            {"apply_edits": "apply_edits", "generate_response": "generate_response"}
+        )
         workflow.add_edge("apply_edits", "generate_response")
         workflow.add_edge("generate_response", END)
 
         return workflow.compile()
 
-    def _parse_intent_node(self, state: VideoEditState) -> VideoEditState:
+    @staticmethod
+    def _route_after_parse(state: VideoEditState) -> str:
+        """Skip apply_edits for intents without edits (help, list, ...) and on errors."""
+        if state.get("should_apply_edits") and not state.get("error"):
+            return "apply_edits"
+        return "generate_response"
+
+    @staticmethod
+    def _session_from_config(config: RunnableConfig) -> Optional[VideoSession]:
+        """Get the session fetched once for this turn from the run config."""
+        return config.get("configurable", {}).get("session")
+
+    async def _parse_message_node(self, state: VideoEditState, config: RunnableConfig) -> Dict[str, Any]:
         """
-        Parse user intent from message.
-        Determines if user wants to add, modify, or remove subtitles.
+        Parse user intent and subtitle parameters from message.
+        A single structured-output LLM call returns both, instead of one
+        call for the intent and a second one for the parameters.
         """
-        user_message = state["user_message"]
-        session_id = state["session_id"]
+        if state.get("cache_hit"):
+            return {}
 
-        # Get current subtitles for context
-        session = session_manager.get_session(session_id)
-        current_subtitles = []
-        if session:
-            current_subtitles = [
-                f"Subtitle {i+1}: \"{sub.text}\" from {sub.start_time}s to {sub.end_time}s"
-                for i, sub in enumerate(session.subtitles)
-            ]
+        user_message = state["user_message"]
 
-        # Create prompt for intent parsing
-        context = "\n".join(current_subtitles) if current_subtitles else "No subtitles yet"
+        session = self._session_from_config(config)
+        subtitles = session.subtitles if session else []
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a subtitle editing assistant. Analyze the user's message and determine their intent.
+        # Skip the LLM for messages like "help" or "make subtitle 2 red"
+        parsed = _fast_classify(user_message, subtitles)
 
-Current subtitles:
-{context}
+        if parsed is None:
+            # Get current subtitles for context
+            context = _format_subtitle_context(subtitles, settings.llm_context_subtitles)
 
-Possible intents:
-- add_subtitle: User wants to add a NEW subtitle (e.g., "add 'hello' at 5 seconds")
-- modify_subtitle: User wants to CHANGE an existing subtitle's text, time, or style (e.g., "make the previous subtitle red", "change the last one to blue", "make subtitle 1 bigger")
-- remove_subtitle: User wants to remove a subtitle
-- list_subtitles: User wants to see current subtitles
-- clear_all: User wants to remove all subtitles
-- help: User needs help
+            response = await self.parse_chain.ainvoke({"message": user_message, "context": context})
 
-IMPORTANT: If user mentions "previous", "last", "that", "this", or references an existing subtitle number, use "modify_subtitle".
+            parsed = self._read_parsed_message(response)
+            if parsed is None:
+                return {"error": "Could not understand the request. Please try rephrasing it."}
 
-Respond with ONLY the intent name, nothing else."""),
-            ("user", "{message}")
-        ])
+        intent = parsed.intent
 
-        chain = prompt | self.llm
-        response = chain.invoke({"message": user_message, "context": context})
+        if intent not in ["add_subtitle", "modify_subtitle", "modify_style"]:
+            return {"intent": intent, "subtitle_edits": [], "should_apply_edits": False}
 
-        intent = response.content.strip().lower()
+        params = parsed.model_dump(exclude={"intent"}, exclude_none=True)
 
-        state["intent"] = intent
-        return state
+        return {
+            "intent": intent,
+            "subtitle_edits": [self._build_subtitle_edit(intent, params)],
+            "extracted_params": params,
+            "should_apply_edits": True
+        }
 
-    def _extract_parameters_node(self, state: VideoEditState) -> VideoEditState:
-        """
-        Extract subtitle parameters from user message using LLM.
-        Extracts: text, start_time, end_time, font_family, font_size, font_color, position.
+    @staticmethod
+    def _read_parsed_message(response: Dict[str, Any]) -> Optional[ParsedMessage]:
         """
-        user_message = state["user_message"]
-        intent = state["intent"]
-        session_id = state["session_id"]
-
-        if intent not in ["add_subtitle", "modify_subtitle", "modify_style"]:
-            state["subtitle_edits"] = []
-            state["should_apply_edits"] = False
-            return state
-
-        # Get current subtitles for context
-        session = session_manager.get_session(session_id)
-        current_subtitles = []
-        if session:
-            current_subtitles = [
-                f"Subtitle {i+1}: \"{sub.text}\" from {sub.start_time}s to {sub.end_time}s, color: {sub.style.font_color}, size: {sub.style.font_size}"
-                for i, sub in enumerate(session.subtitles)
-            ]
-
-        context = "\n".join(current_subtitles) if current_subtitles else "No subtitles yet"
-
-        # Create prompt for parameter extraction
-        if intent == "modify_subtitle":
-            system_message = """You are a subtitle parameter extractor. Extract which subtitle to modify and what changes to make.
-
-Current subtitles:
-{context}
-
-Extract the following parameters:
-- subtitle_index: Which subtitle to modify (use -1 for last/previous/most recent, or specific number like 0, 1, 2). REQUIRED for modifications.
-- text: New subtitle text (only if user wants to change the text)
-- start_time: New start time (only if user wants to change timing)
-- end_time: New end time (only if user wants to change timing)
-- font_family: New font name (only if user wants to change font)
-- font_size: New font size in pixels (only if user wants to change size)
-- font_color: New color name or hex (only if user wants to change color)
-- position: New position - top, center, or bottom (only if user wants to change position)
-- bold: true or false (only if user mentions bold)
-- italic: true or false (only if user mentions italic)
+        Get the ParsedMessage from a structured-output response.
 
-IMPORTANT:
-- For "previous", "last", or "that subtitle", use subtitle_index: -1
-- For "subtitle 1" or "first subtitle", use subtitle_index: 0
-- For "subtitle 2", use subtitle_index: 1
-- Only include parameters that the user wants to CHANGE, use null for others
+        Falls back to the raw tool-call arguments or JSON embedded in the
+        message text when the provider's output could not be parsed directly.
+        """
+        if response.get("parsed") is not None:
+            return response["parsed"]
 
-Respond with ONLY a JSON object.
-Example: {{"subtitle_index": -1, "font_color": "red"}} for "make the previous subtitle red"
-Example: {{"subtitle_index": 0, "font_size": 48}} for "make subtitle 1 bigger" """
-        else:
-            system_message = """You are a subtitle parameter extractor. Extract subtitle information from the user's message.
+        raw = response.get("raw")
+        candidates = [call.get("args") for call in getattr(raw, "tool_calls", None) or []]
 
-Extract the following parameters:
-- text: The subtitle text (REQUIRED for new subtitles)
-- start_time: Start time in seconds or time format (e.g., "5 seconds", "1:30", "0:00:05")
-- end_time: End time in seconds or time format
-- font_family: Font name (e.g., Arial, Helvetica, Roboto)
-- font_size: Font size in pixels (12-72)
-- font_color: Color name or hex (e.g., red, #FF0000, white)
-- position: top, center, or bottom
-- bold: true or false
-- italic: true or false
+        content = getattr(raw, "content", None)
+        if isinstance(content, str):
+            # Try to extract JSON from response
+            params = _extract_json_object(content)
+            if params is not None:
+                candidates.append(params)
 
-Respond with ONLY a JSON object containing the extracted parameters. Use null for missing values.
-Example: {{"text": "Hello", "start_time": "0", "end_time": "5", "font_color": "red", "font_size": 32}}"""
+        for candidate in candidates:
+            try:
+                return ParsedMessage.model_validate(candidate)
+            except ValidationError:
+                continue
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_message),
-            ("user", "{message}")
-        ])
+        return None
 
-        chain = prompt | self.llm
-        response = chain.invoke({"message": user_message, "context": context})
+    @staticmethod
+    def _build_subtitle_edit(intent: str, params: Dict[str, Any]) -> SubtitleEdit:
+        """
+        Turn extracted parameters into a subtitle edit.
 
-        # Parse JSON response
-        try:
-            params = json.loads(response.content.strip())
-        except json.JSONDecodeError:
-            # Try to extract JSON from response
-            json_match = re.search(r'\{[^}]+\}', response.content)
-            if json_match:
-                params = json.loads(json_match.group())
-            else:
-                params = {}
+        Args:
+            intent: Parsed intent (add or modify)
+            params: Extracted parameters (unset values omitted)
 
+        Returns:
+            SubtitleEdit with parsed times and defaults applied
+        """
         # Handle modification vs addition
         if intent == "modify_subtitle":
             # For modifications, preserve nulls to indicate unchanged fields
+            subtitle_index = params.get("subtitle_index")
             subtitle_edit: SubtitleEdit = {
-                "subtitle_index": params.get("subtitle_index", -1),  # Default to last subtitle
+                "subtitle_index": subtitle_index if subtitle_index is not None else -1,  # Default to last subtitle
                 "text": params.get("text"),
                 "start_time": None,
                 "end_time": None,
@@ -241,63 +487,58 @@ Example: {{"text": "Hello", "start_time": "0", "end_time": "5", "font_color": "r
             if params.get("end_time") is not None:
                 subtitle_edit["end_time"] = parse_time_string(str(params["end_time"]))
 
-        else:
-            # For new subtitles, parse times and apply defaults
-            start_time = params.get("start_time")
-            if start_time:
-                start_time = parse_time_string(str(start_time))
-            start_time = start_time if start_time is not None else 0.0
-
-            end_time = params.get("end_time")
-            if end_time:
-                end_time = parse_time_string(str(end_time))
+            return subtitle_edit
 
-            # If no end_time provided, default to start_time + 3 seconds
-            if end_time is None:
-                end_time = start_time + 3.0
+        # For new subtitles, parse times and apply defaults
+        start_time = params.get("start_time")
+        if start_time:
+            start_time = parse_time_string(str(start_time))
+        start_time = start_time if start_time is not None else 0.0
 
-            # Ensure end_time is after start_time
-            if end_time <= start_time:
-                end_time = start_time + 3.0
+        end_time = params.get("end_time")
+        if end_time:
+            end_time = parse_time_string(str(end_time))
 
-            # Create subtitle edit for new subtitle
-            subtitle_edit: SubtitleEdit = {
-                "text": params.get("text") or "",
-                "start_time": float(start_time),
-                "end_time": float(end_time),
-                "font_family": params.get("font_family"),
-                "font_size": params.get("font_size"),
-                "font_color": params.get("font_color"),
-                "position": params.get("position"),
-                "bold": params.get("bold"),
-                "italic": params.get("italic")
-            }
+        # If no end_time provided, default to start_time + 3 seconds
+        if end_time is None:
+            end_time = start_time + 3.0
 
-        state["subtitle_edits"] = [subtitle_edit]
-        state["extracted_params"] = params
-        state["should_apply_edits"] = True
+        # Ensure end_time is after start_time
+        if end_time <= start_time:
+            end_time = start_time + 3.0
 
-        return state
+        # Create subtitle edit for new subtitle
+        return {
+            "text": params.get("text") or "",
+            "start_time": float(start_time),
+            "end_time": float(end_time),
+            "font_family": params.get("font_family"),
+            "font_size": params.get("font_size"),
+            "font_color": params.get("font_color"),
+            "position": params.get("position"),
+            "bold": params.get("bold"),
+            "italic": params.get("italic")
+        }
 
-    def _apply_edits_node(self, state: VideoEditState) -> VideoEditState:
+    async def _apply_edits_node(self, state: VideoEditState, config: RunnableConfig) -> Dict[str, Any]:
         """Apply subtitle edits to the session."""
         if not state.get("should_apply_edits", False):
-            return state
+            return {}
 
-        session_id = state["session_id"]
         subtitle_edits = state.get("subtitle_edits", [])
         intent = state.get("intent", "")
 
         if not subtitle_edits:
-            return state
+            return {}
 
         # Get current subtitles from session
-        session = session_manager.get_session(session_id)
+        session = self._session_from_config(config)
         if not session:
-            state["error"] = "Session not found"
-            return state
+            return {"error": "Session not found"}
 
-        current_subtitles = list(session.subtitles)
+        # Edit the session's list in place: one replace/append per edit
+        current_subtitles = session.subtitles
+        updates: Dict[str, Any] = {}
 
         # Apply each edit
         for edit in subtitle_edits:
@@ -312,31 +553,35 @@ Example: {{"text": "Hello", "start_time": "0", "end_time": "5", "font_color": "r
 
                 # Validate index
                 if index < 0 or index >= len(current_subtitles):
-                    state["error"] = f"Invalid subtitle index: {edit['subtitle_index']}"
-                    return state
+                    updates["error"] = f"Invalid subtitle index: {edit['subtitle_index']}"
+                    return updates
 
                 # Get existing subtitle
                 existing = current_subtitles[index]
 
-                # Process font_color - convert color names to hex
-                new_font_color = existing.style.font_color
-                if edit.get("font_color") is not None:
-                    color = edit["font_color"]
-                    # Convert color name to hex if needed
-                    if not color.startswith("#"):
-                        new_font_color = color_name_to_hex(color)
-                    else:
-                        new_font_color = color
-
-                # Update only the fields that are specified (not None)
-                updated_style = SubtitleStyle(
-                    font_family=edit.get("font_family") if edit.get("font_family") is not None else existing.style.font_family,
-                    font_size=edit.get("font_size") if edit.get("font_size") is not None else existing.style.font_size,
-                    font_color=new_font_color,
-                    position=edit.get("position") if edit.get("position") is not None else existing.style.position,
-                    bold=edit.get("bold") if edit.get("bold") is not None else existing.style.bold,
-                    italic=edit.get("italic") if edit.get("italic") is not None else existing.style.italic
-                )
+                if all(edit.get(field) is None for field in _STYLE_FIELDS):
+                    # Text/time-only edit: keep the existing style object
+                    updated_style = existing.style
+                else:
+                    # Process font_color - convert color names to hex
+                    new_font_color = existing.style.font_color
+                    if edit.get("font_color") is not None:
+                        color = edit["font_color"]
+                        # Convert color name to hex if needed
+                        if not color.startswith("#"):
+                            new_font_color = color_name_to_hex(color)
+                        else:
+                            new_font_color = color
+
+                    # Update only the fields that are specified (not None)
+                    updated_style = SubtitleStyle(
+                        font_family=edit.get("font_family") if edit.get("font_family") is not None else existing.style.font_family,
+                        font_size=edit.get("font_size") if edit.get("font_size") is not None else existing.style.font_size,
+                        font_color=new_font_color,
+                        position=edit.get("position") if edit.get("position") is not None else existing.style.position,
+                        bold=edit.get("bold") if edit.get("bold") is not None else existing.style.bold,
+                        italic=edit.get("italic") if edit.get("italic") is not None else existing.style.italic
+                    )
 
                 # Create modified subtitle
                 modified_subtitle = Subtitle(
@@ -349,21 +594,20 @@ Example: {{"text": "Hello", "start_time": "0", "end_time": "5", "font_color": "r
 
                 # Replace the subtitle at this index
                 current_subtitles[index] = modified_subtitle
-                state["modified_index"] = index  # Track which subtitle was modified
+                updates["modified_index"] = index  # Track which subtitle was modified
 
             else:
                 # ADD new subtitle
-                # Process font_color - convert color names to hex
-                font_color = edit.get("font_color") or settings.default_font_color
-                if font_color and not font_color.startswith("#"):
-                    font_color = color_name_to_hex(font_color)
-
-                subtitle = Subtitle(
-                    id=generate_id("sub"),
-                    text=edit["text"],
-                    start_time=edit["start_time"],
-                    end_time=edit["end_time"],
-                    style=SubtitleStyle(
+                if not any(edit.get(field) for field in _STYLE_FIELDS):
+                    # No style overrides: share the prebuilt default style
+                    style = _DEFAULT_STYLE
+                else:
+                    # Process font_color - convert color names to hex
+                    font_color = edit.get("font_color") or settings.default_font_color
+                    if font_color and not font_color.startswith("#"):
+                        font_color = color_name_to_hex(font_color)
+
+                    style = SubtitleStyle(
                         font_family=edit.get("font_family") or settings.default_font_family,
                         font_size=edit.get("font_size") or settings.default_font_size,
                         font_color=font_color,
@@ -371,27 +615,27 @@ Example: {{"text": "Hello", "start_time": "0", "end_time": "5", "font_color": "r
                         bold=edit.get("bold") or False,
                         italic=edit.get("italic") or False
                     )
+
+                subtitle = Subtitle(
+                    id=generate_id("sub"),
+                    text=edit["text"],
+                    start_time=edit["start_time"],
+                    end_time=edit["end_time"],
+                    style=style
                 )
                 current_subtitles.append(subtitle)
 
-        # Update session with modified/new subtitles
-        session_manager.update_subtitles(session_id, current_subtitles)
-
-        # Update state
-        state["current_subtitles"] = [sub.model_dump() for sub in current_subtitles]
+        # Return only the changed state keys
+        return updates
 
-        return state
-
-    def _generate_response_node(self, state: VideoEditState) -> VideoEditState:
+    async def _generate_response_node(self, state: VideoEditState) -> Dict[str, Any]:
         """Generate AI response based on the action taken."""
         intent = state.get("intent", "")
         subtitle_edits = state.get("subtitle_edits", [])
         error = state.get("error")
 
         if error:
-            state["ai_response"] = f"Error: {error}"
-            state["workflow_complete"] = True
-            return state
+            return {"ai_response": f"Error: {error}", "workflow_complete": True}
 
         # Generate appropriate response based on intent
         if intent == "add_subtitle" and subtitle_edits:
@@ -413,7 +657,7 @@ Example: {{"text": "Hello", "start_time": "0", "end_time": "5", "font_color": "r
             if style_parts:
                 response += f" with {', '.join(style_parts)}"
 
-            state["ai_response"] = response
+            ai_response = response
 
         elif intent == "modify_subtitle" and subtitle_edits:
             edit = subtitle_edits[0]
@@ -440,10 +684,10 @@ Example: {{"text": "Hello", "start_time": "0", "end_time": "5", "font_color": "r
             if changes:
                 response += f": changed {', '.join(changes)}"
 
-            state["ai_response"] = response
+            ai_response = response
 
         elif intent == "help":
-            state["ai_response"] = """I can help you add and modify subtitles! Here are some examples:
+            ai_response = """I can help you add and modify subtitles! Here are some examples:
 
 **Adding subtitles:**
 • "Add subtitle 'Hello World' from 0 to 5 seconds"
@@ -465,15 +709,96 @@ I understand:
 - Styles: bold, italic"""
 
         else:
-            state["ai_response"] = "I'm ready to help you add subtitles!"
+            ai_response = "I'm ready to help you add subtitles!"
+
+        return {"ai_response": ai_response, "workflow_complete": True}
+
+    async def _build_initial_state(
+        self,
+        session_id: str,
+        user_message: str,
+        session
+    ) -> VideoEditState:
+        """Build the initial workflow state for a chat turn."""
+        state: VideoEditState = {
+            "session_id": session_id,
+            "user_message": user_message,
+            "intent": None,
+            "extracted_params": None,
+            "subtitle_edits": None,
+            "ai_response": None,
+            "error": None,
+            "cache_context": None,
+            "cache_hit": False,
+            "should_apply_edits": False,
+            "workflow_complete": False
+        }
+
+        # Restore intent/parameters for near-duplicate prompts on the same subtitle state
+        if settings.semantic_cache_enabled:
+            state["cache_context"] = semantic_cache.context_hash(session.subtitles)
+            # Embedding lookup is CPU-bound; keep it off the event loop
+            cached = await asyncio.to_thread(semantic_cache.get, state["cache_context"], user_message)
+            if cached is not None:
+                state.update(copy.deepcopy(cached))
+                state["cache_hit"] = True
 
-        state["workflow_complete"] = True
         return state
 
+    async def _finalize_turn(
+        self,
+        session: VideoSession,
+        user_message: str,
+        final_state: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Save chat messages for a finished turn and build the result dict."""
+        # Cache the LLM-derived part of the turn for near-duplicate prompts
+        if (
+            settings.semantic_cache_enabled
+            and not final_state.get("cache_hit")
+            and not final_state.get("error")
+            and final_state.get("cache_context") is not None
+        ):
+            await asyncio.to_thread(
+                semantic_cache.set,
+                final_state["cache_context"],
+                user_message,
+                copy.deepcopy({
+                    "intent": final_state.get("intent"),
+                    "extracted_params": final_state.get("extracted_params"),
+                    "subtitle_edits": final_state.get("subtitle_edits"),
+                    "should_apply_edits": final_state.get("should_apply_edits", False)
+                })
+            )
+
+        # Save chat messages (one timestamp for the whole turn)
+        now = datetime.now()
+        user_chat_msg = ChatMessage(
+            type=MessageType.USER,
+            content=user_message,
+            timestamp=now
+        )
+        ai_chat_msg = ChatMessage(
+            type=MessageType.AI,
+            content=final_state.get("ai_response") or "Done!",
+            timestamp=now,
+            metadata=final_state.get("extracted_params")
+        )
+        session_manager.add_chat_messages(session.session_id, [user_chat_msg, ai_chat_msg])
+
+        return {
+            "ai_response": final_state.get("ai_response", "Done!"),
+            "message": ai_chat_msg,
+            "subtitles": list(session.subtitles),
+            "intent": final_state.get("intent"),
+            "extracted_params": final_state.get("extracted_params")
+        }
+
     async def process_message(
         self,
         session_id: str,
-        user_message: str
+        user_message: str,
+        session: Optional[VideoSession] = None
     ) -> Dict[str, Any]:
         """
         Process user message through LangGraph workflow.
@@ -481,12 +806,14 @@ I understand:
         Args:
             session_id: Video editing session ID
             user_message: User's chat message
+            session: Session already fetched by the caller (looked up if omitted)
 
         Returns:
             Dictionary with AI response and updated subtitles
         """
-        # Get current session
-        session = session_manager.get_session(session_id)
+        # Get current session (once; nodes receive it through the run config)
+        if session is None:
+            session = session_manager.get_session(session_id)
         if not session:
             return {
                 "error": "Session not found or expired",
@@ -494,63 +821,82 @@ I understand:
                 "subtitles": []
             }
 
-        # Get chat history
-        chat_history = session_manager.get_chat_history(session_id)
-
         # Initialize state
-        initial_state: VideoEditState = {
-            "session_id": session_id,
-            "user_message": user_message,
-            "intent": None,
-            "extracted_params": None,
-            "current_subtitles": [sub.model_dump() for sub in session.subtitles],
-            "subtitle_edits": None,
-            "chat_history": [
-                {"role": msg.type.value, "content": msg.content}
-                for msg in chat_history
-            ],
-            "ai_response": None,
-            "error": None,
-            "should_apply_edits": False,
-            "workflow_complete": False
-        }
+        initial_state = await self._build_initial_state(session_id, user_message, session)
 
         # Run workflow
         try:
-            final_state = self.workflow.invoke(initial_state)
+            final_state = await self.workflow.ainvoke(
+                initial_state, config={"configurable": {"session": session}}
+            )
         except Exception as e:
             return {
                 "error": str(e),
                 "ai_response": f"Sorry, I encountered an error: {str(e)}",
-                "subtitles": [sub.model_dump() for sub in session.subtitles]
+                "subtitles": list(session.subtitles)
             }
 
-        # Save chat messages
-        user_chat_msg = ChatMessage(
-            type=MessageType.USER,
-            content=user_message,
-            timestamp=datetime.now()
-        )
-        session_manager.add_chat_message(session_id, user_chat_msg)
+        return await self._finalize_turn(session, user_message, final_state)
 
-        ai_chat_msg = ChatMessage(
-            type=MessageType.AI,
-            content=final_state["ai_response"] or "Done!",
-            timestamp=datetime.now(),
-            metadata=final_state.get("extracted_params")
-        )
-        session_manager.add_chat_message(session_id, ai_chat_msg)
+    async def astream_message(
+        self,
+        session_id: str,
+        user_message: str,
+        session: Optional[VideoSession] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream a chat turn through the LangGraph workflow.
 
-        # Get updated subtitles
-        updated_session = session_manager.get_session(session_id)
-        subtitles = updated_session.subtitles if updated_session else []
+        Yields ``(kind, payload)`` tuples as the workflow progresses:
 
-        return {
-            "ai_response": final_state.get("ai_response", "Done!"),
-            "subtitles": [sub.model_dump() for sub in subtitles],
-            "intent": final_state.get("intent"),
-            "extracted_params": final_state.get("extracted_params")
-        }
+        - ``("status", {"phase": ..., "status": ...})`` when a workflow step starts
+        - ``("delta", text)`` with response text as soon as it is produced
+        - ``("result", result)`` once, last, with the same dict as ``process_message``
+
+        Args:
+            session_id: Video editing session ID
+            user_message: User's chat message
+            session: Session already fetched by the caller (looked up if omitted)
+        """
+        if session is None:
+            session = session_manager.get_session(session_id)
+        if not session:
+            yield "result", {
+                "error": "Session not found or expired",
+                "ai_response": "Session not found. Please upload a video first.",
+                "subtitles": []
+            }
+            return
+
+        initial_state = await self._build_initial_state(session_id, user_message, session)
+        final_state: Dict[str, Any] = dict(initial_state)
+
+        if not initial_state.get("cache_hit"):
+            yield "status", {"phase": "parse_message", "status": "Understanding your request..."}
+
+        try:
+            async for update in self.workflow.astream(
+                initial_state,
+                config={"configurable": {"session": session}},
+                stream_mode="updates"
+            ):
+                for node_name, node_state in update.items():
+                    if not node_state:
+                        continue
+                    final_state.update(node_state)
+                    if node_name == "parse_message" and self._route_after_parse(final_state) == "apply_edits":
+                        yield "status", {"phase": "apply_edits", "status": "Applying changes..."}
+                    elif node_name == "generate_response" and node_state.get("ai_response"):
+                        yield "delta", node_state["ai_response"]
+        except Exception as e:
+            yield "result", {
+                "error": str(e),
+                "ai_response": f"Sorry, I encountered an error: {str(e)}",
+                "subtitles": list(session.subtitles)
+            }
+            return
+
+        yield "result", await self._finalize_turn(session, user_message, final_state)
 
 
 # Global LLM service instance
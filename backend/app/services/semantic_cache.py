@@ -0,0 +1,238 @@
+"""
+Semantic cache for LLM-parsed chat turns.
+
+Caches the LLM-derived part of a chat turn (intent and extracted parameters)
+keyed by the session's subtitle state and the user message, so near-duplicate
+prompts skip the LLM round-trips. Edits are still applied by the workflow on
+a hit, so the session stays consistent.
+
+Similarity matching uses sentence-transformers embeddings when installed and
+falls back to exact matching on the whitespace-normalized message otherwise.
+"""
+
+import re
+import time
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Optional embedding support
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    EMBEDDINGS_AVAILABLE = False
+
+from app.config import settings
+from app.models.schemas import Subtitle
+
+logger = logging.getLogger(__name__)
+
+
+# Prompts that depend on wall-clock time must never be served from cache
+_TIME_SENSITIVE_PATTERN = re.compile(r"\b(now|current time|right now|today)\b", re.IGNORECASE)
+
+# Literal values that must match exactly for two messages to share a result:
+# quoted text, numbers, hex colors and capitalized words (e.g. font names)
+_LITERAL_PATTERN = re.compile(
+    r"\"[^\"]*\"|'[^']*'|#[0-9a-fA-F]{3,6}\b|\d+(?:\.\d+)?|\b[A-Z][A-Za-z]+\b"
+)
+_WORD_PATTERN = re.compile(r"[a-z]+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Style vocabulary that changes the edit even when the rest of the prompt is similar
+_STYLE_WORDS = frozenset({
+    "white", "black", "red", "green", "blue", "yellow", "cyan", "magenta",
+    "orange", "purple", "pink", "brown", "gray", "grey",
+    "top", "center", "middle", "bottom",
+    "bold", "italic", "bigger", "smaller", "larger",
+    "first", "last", "previous", "not", "remove", "delete", "clear",
+})
+
+
+class _CacheEntry:
+    """Single cached chat-turn result."""
+
+    __slots__ = ("context_hash", "signature", "embedding", "value", "expires_at")
+
+    def __init__(self, context_hash: int, signature: Tuple[str, ...], embedding, value: Dict[str, Any], expires_at: float):
+        self.context_hash = context_hash
+        self.signature = signature
+        self.embedding = embedding
+        self.value = value
+        self.expires_at = expires_at
+
+
+class SemanticCache:
+    """LRU + TTL cache of LLM parse results with optional embedding similarity."""
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        ttl: int = 3600,
+        max_entries: int = 512,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+    ):
+        """
+        Initialize semantic cache
+
+        Args:
+            threshold: Minimum cosine similarity for a semantic hit
+            ttl: Entry lifetime in seconds
+            max_entries: Maximum number of cached entries (LRU eviction)
+            model_name: sentence-transformers model used for embeddings
+        """
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.model_name = model_name
+        self._entries: "OrderedDict[Tuple[int, str], _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._model = None
+
+    @staticmethod
+    def context_hash(subtitles: List[Subtitle]) -> int:
+        """
+        Hash the subtitle state a message was interpreted against.
+
+        Covers exactly the fields shown to the LLM in the parse prompt, so
+        changes the model never sees (font, position, ids) keep cache hits,
+        while relative edits ("bigger") still miss once the size changed.
+        """
+        return hash(tuple(
+            (sub.text, sub.start_time, sub.end_time, sub.style.font_color, sub.style.font_size)
+            for sub in subtitles
+        ))
+
+    @staticmethod
+    def is_cacheable(message: str) -> bool:
+        """Return False for prompts whose meaning depends on the current time."""
+        return not _TIME_SENSITIVE_PATTERN.search(message)
+
+    def get(self, context_hash: int, message: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result for a message.
+
+        Args:
+            context_hash: Hash of the session's current subtitles
+            message: User chat message
+
+        Returns:
+            Cached result dict or None on miss
+        """
+        if not self.is_cacheable(message):
+            return None
+
+        normalized = self._normalize(message)
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_expired(now)
+
+            entry = self._entries.get((context_hash, normalized))
+            if entry is not None:
+                self._entries.move_to_end((context_hash, normalized))
+                return entry.value
+
+            if not EMBEDDINGS_AVAILABLE:
+                return None
+
+            signature = self._signature(message)
+            candidates = [
+                (key, entry) for key, entry in self._entries.items()
+                if entry.context_hash == context_hash
+                and entry.signature == signature
+                and entry.embedding is not None
+            ]
+
+        if not candidates:
+            return None
+
+        embedding = self._embed(message)
+        if embedding is None:
+            return None
+
+        scores = np.stack([entry.embedding for _, entry in candidates]) @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+
+        key, entry = candidates[best]
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return entry.value
+
+    def set(self, context_hash: int, message: str, value: Dict[str, Any]) -> None:
+        """
+        Store a result for a message.
+
+        Args:
+            context_hash: Hash of the session's subtitles before the turn
+            message: User chat message
+            value: LLM-derived result to cache
+        """
+        if not self.is_cacheable(message):
+            return
+
+        normalized = self._normalize(message)
+        embedding = self._embed(message) if EMBEDDINGS_AVAILABLE else None
+        entry = _CacheEntry(
+            context_hash=context_hash,
+            signature=self._signature(message),
+            embedding=embedding,
+            value=value,
+            expires_at=time.monotonic() + self.ttl
+        )
+
+        with self._lock:
+            self._entries[(context_hash, normalized)] = entry
+            self._entries.move_to_end((context_hash, normalized))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict_expired(self, now: float) -> None:
+        """Drop expired entries. Caller must hold the lock."""
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def _embed(self, message: str):
+        """Return a normalized embedding for a message, or None if unavailable."""
+        try:
+            if self._model is None:
+                self._model = SentenceTransformer(self.model_name)
+            return self._model.encode(message, normalize_embeddings=True)
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {str(e)}")
+            return None
+
+    @staticmethod
+    def _normalize(message: str) -> str:
+        """Collapse whitespace; case is kept since it matters for subtitle text."""
+        return _WHITESPACE_PATTERN.sub(" ", message).strip()
+
+    @staticmethod
+    def _signature(message: str) -> Tuple[str, ...]:
+        """Extract the literal values that must match for a semantic hit."""
+        # Ignore the leading word so "Add ..." and "Put ..." are not split by capitalization
+        _, _, rest = message.strip().partition(" ")
+        literals = _LITERAL_PATTERN.findall(rest)
+        style_words = [w for w in _WORD_PATTERN.findall(message.lower()) if w in _STYLE_WORDS]
+        return tuple(sorted(literals)) + tuple(sorted(style_words))
+
+
+# Global semantic cache instance
+semantic_cache = SemanticCache(
+    threshold=settings.semantic_cache_threshold,
+    ttl=settings.semantic_cache_ttl,
+    max_entries=settings.semantic_cache_max_entries,
+    model_name=settings.semantic_cache_model
+)
@@ -4,15 +4,62 @@ Silence Detection and Removal Service
 Detects silent segments in videos and removes them using FFmpeg.
 """
 
+import bisect
 import os
 import re
+import shutil
 import subprocess
 import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
+# Input duration from FFmpeg's stderr header (e.g. "Duration: 00:01:23.45")
+_DURATION_PATTERN = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+
+# Max distance (seconds) a kept segment's start may be moved back to the
+# previous keyframe so the cut can be stream-copied instead of re-encoded
+KEYFRAME_SNAP_TOLERANCE = 0.1
+
+# Quality for silence-removal re-encodes (libx264 CRF/preset; CRF doubles as the
+# hardware encoders' quality level)
+SILENCE_ENCODE_CRF = "23"
+SILENCE_ENCODE_PRESET = "fast"
+
+# Pipe buffer for FFmpeg/ffprobe output (their stderr logs are chatty)
+_PIPE_BUFSIZE = 1 << 20
+
+# FFmpeg threads per segment encoder when segments are encoded in parallel
+SEGMENT_ENCODER_THREADS = 4
+
+# silencedetect log markers: "silence_start: 1.5" / "silence_end: 3.2 | silence_duration: 1.7"
+_SILENCE_MARKER = "silence_"
+_START_FIELD = "start: "
+_END_FIELD = "end: "
+_DURATION_FIELD = " | silence_duration: "
+_NUMBER_CHARS = frozenset("-+.0123456789eE")
+
+
+def _read_number(text: str, pos: int) -> Tuple[Optional[float], int]:
+    """Read a float starting at pos; returns (value or None, index after the token)."""
+    end = pos
+    length = len(text)
+    while end < length and text[end] in _NUMBER_CHARS:
+        end += 1
+    try:
+        return float(text[pos:end]), end
+    except ValueError:
+        return None, end
+
+
 class SilenceSegment:
     """Represents a silent segment in a video"""
     def __init__(self, start: float, end: float, duration: float):
@@ -28,6 +75,51 @@ class SilenceSegment:
         }
 
 
+class _SilenceLogParser:
+    """Incremental parser for FFmpeg silencedetect logs (whole log or line by line)."""
+
+    __slots__ = ("segments", "duration", "_pending_start")
+
+    def __init__(self):
+        self.segments: List[SilenceSegment] = []
+        self.duration: Optional[float] = None
+        self._pending_start: Optional[float] = None
+
+    def feed(self, text: str) -> None:
+        """Consume log text; each silence_end closes the pending silence_start."""
+        if self.duration is None:
+            duration_match = _DURATION_PATTERN.search(text)
+            if duration_match:
+                hours, minutes, seconds = duration_match.groups()
+                self.duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+        # Scan for literal markers instead of running a regex over every line
+        pos = text.find(_SILENCE_MARKER)
+        while pos != -1:
+            pos += len(_SILENCE_MARKER)
+
+            if text.startswith(_START_FIELD, pos):
+                start_time, pos = _read_number(text, pos + len(_START_FIELD))
+                if start_time is not None:
+                    self._pending_start = start_time
+
+            elif text.startswith(_END_FIELD, pos):
+                end_time, pos = _read_number(text, pos + len(_END_FIELD))
+                duration = None
+                if text.startswith(_DURATION_FIELD, pos):
+                    duration, pos = _read_number(text, pos + len(_DURATION_FIELD))
+
+                if end_time is not None and self._pending_start is not None:
+                    self.segments.append(SilenceSegment(
+                        self._pending_start,
+                        end_time,
+                        duration if duration is not None else end_time - self._pending_start
+                    ))
+                    self._pending_start = None
+
+            pos = text.find(_SILENCE_MARKER, pos)
+
+
 class SilenceRemoverService:
     """Service for detecting and removing silence from videos"""
 
@@ -57,29 +149,38 @@ class SilenceRemoverService:
             Tuple of (list of silence segments, total video duration)
         """
         try:
-            # Run FFmpeg silence detection
+            # Run FFmpeg silence detection (audio only: -vn skips video decoding)
             cmd = [
                 "ffmpeg",
+                "-hide_banner",
+                "-nostats",
                 "-i", video_path,
+                "-vn",
                 "-af", f"silencedetect=noise={self.noise_threshold}:d={self.min_silence_duration}",
                 "-f", "null",
                 "-"
             ]
 
-            result = subprocess.run(
+            # Parse stderr line by line while FFmpeg runs instead of buffering the whole log
+            parser = _SilenceLogParser()
+            with subprocess.Popen(
                 cmd,
-                stdout=subprocess.PIPE,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
-                text=True
-            )
+                text=True,
+                errors="replace",
+                bufsize=_PIPE_BUFSIZE
+            ) as process:
+                for line in process.stderr:
+                    parser.feed(line)
 
-            output = result.stderr
+            silence_segments = parser.segments
 
-            # Parse silence segments from FFmpeg output
-            silence_segments = self._parse_silence_output(output)
-
-            # Get video duration
-            duration = self._get_video_duration(video_path)
+            # Duration comes from the same FFmpeg run; ffprobe only if it's missing
+            duration = parser.duration
+            if duration is None:
+                duration = self._get_video_duration(video_path)
 
             logger.info(f"Detected {len(silence_segments)} silent segments in {video_path}")
 
@@ -89,7 +190,7 @@ class SilenceRemoverService:
             logger.error(f"Error detecting silence: {str(e)}")
             raise
 
-    def _parse_silence_output(self, output: str) -> List[SilenceSegment]:
+    def parse_silence_output(self, output: str) -> List[SilenceSegment]:
         """
         Parse FFmpeg silence detection output
 
@@ -99,25 +200,9 @@ class SilenceRemoverService:
         Returns:
             List of SilenceSegment objects
         """
-        segments = []
-
-        # Pattern to match silence_start and silence_end
-        start_pattern = r"silence_start: ([\d.]+)"
-        end_pattern = r"silence_end: ([\d.]+) \| silence_duration: ([\d.]+)"
-
-        starts = re.finditer(start_pattern, output)
-        ends = re.finditer(end_pattern, output)
-
-        start_times = [float(m.group(1)) for m in starts]
-        end_data = [(float(m.group(1)), float(m.group(2))) for m in ends]
-
-        # Match starts with ends
-        for i, (end_time, duration) in enumerate(end_data):
-            if i < len(start_times):
-                start_time = start_times[i]
-                segments.append(SilenceSegment(start_time, end_time, duration))
-
-        return segments
+        parser = _SilenceLogParser()
+        parser.feed(output)
+        return parser.segments
 
     def _get_video_duration(self, video_path: str) -> float:
         """
@@ -137,7 +222,14 @@ class SilenceRemoverService:
             video_path
         ]
 
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        result = subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=_PIPE_BUFSIZE
+        )
         duration = float(result.stdout.strip())
 
         return duration
@@ -146,8 +238,9 @@ class SilenceRemoverService:
         self,
         input_path: str,
         output_path: str,
-        silence_segments: Optional[List[SilenceSegment]] = None
-    ) -> str:
+        silence_segments: Optional[List[SilenceSegment]] = None,
+        duration: Optional[float] = None
+    ) -> Tuple[str, List[Tuple[float, float]]]:
         """
         Remove silent segments from video
 
@@ -155,23 +248,27 @@ class SilenceRemoverService:
             input_path: Path to input video
             output_path: Path to output video
             silence_segments: Optional list of silence segments (will detect if not provided)
+            duration: Optional total video duration (probed if not provided)
 
         Returns:
-            Path to output video
+            Tuple of (path to output video, (start, end) segments of the input
+            that were kept; keyframe-snapped when stream-copied, empty if
+            nothing was cut)
         """
         try:
             # Detect silence if not provided
             if silence_segments is None:
-                silence_segments, _ = self.detect_silence(input_path)
+                silence_segments, duration = self.detect_silence(input_path)
 
             if not silence_segments:
                 logger.info("No silence detected, copying original video")
-                # No silence to remove, just copy the file
-                subprocess.run(["cp", input_path, output_path], check=True)
-                return output_path
+                # No silence to remove, just copy the file (in-kernel, no process spawn)
+                shutil.copyfile(input_path, output_path)
+                return output_path, []
 
-            # Get video duration
-            duration = self._get_video_duration(input_path)
+            # Get video duration (already known from detection in the usual case)
+            if duration is None:
+                duration = self._get_video_duration(input_path)
 
             # Calculate non-silent segments (parts to keep)
             keep_segments = self._calculate_keep_segments(silence_segments, duration)
@@ -179,29 +276,64 @@ class SilenceRemoverService:
             if not keep_segments:
                 raise ValueError("No non-silent segments found in video")
 
+            # Cuts that land (almost) on keyframes can be stream-copied without re-encoding
+            snapped_segments = self._snap_to_keyframes(input_path, keep_segments)
+            if snapped_segments is not None and self._concat_copy(
+                [(input_path, start, end) for start, end in snapped_segments], output_path
+            ):
+                logger.info(f"Removed silence by stream copy from {input_path} -> {output_path}")
+                return output_path, snapped_segments
+
+            global_args, video_args, upload_filter = self._video_encoder_args()
+
+            # Several segments and spare cores: encode segments side by side
+            # (software encoder only; hardware encoders are fast enough in one process)
+            max_workers = min(len(keep_segments), max(1, (os.cpu_count() or 1) // SEGMENT_ENCODER_THREADS))
+            if video_args[:2] == ["-c:v", "libx264"] and max_workers > 1:
+                try:
+                    encoded = self._encode_segments_parallel(input_path, keep_segments, output_path, max_workers)
+                except RuntimeError as e:
+                    # Fall back to the single-process re-encode below
+                    logger.warning(f"Parallel segment encode failed, re-encoding in one pass: {str(e)}")
+                    encoded = False
+                if encoded:
+                    logger.info(f"Removed silence with {max_workers} parallel encoders: {input_path} -> {output_path}")
+                    return output_path, keep_segments
+
             # Create filter complex for cutting and concatenating
             filter_complex = self._build_filter_complex(keep_segments)
+            video_label = "[outv]"
+            if upload_filter:
+                # e.g. VAAPI: upload the cut frames to the GPU encoder
+                filter_complex += f";[outv]{upload_filter}[outv_hw]"
+                video_label = "[outv_hw]"
 
-            # Run FFmpeg to remove silence
+            # Run FFmpeg to remove silence (hardware encoder when one is available)
             cmd = [
                 "ffmpeg",
+                "-hide_banner",
+                "-nostats",
+                "-loglevel", "error",
+                *global_args,
                 "-i", input_path,
                 "-filter_complex", filter_complex,
-                "-map", "[outv]",
+                "-map", video_label,
                 "-map", "[outa]",
-                "-c:v", "libx264",
-                "-preset", "fast",
+                *video_args,
                 "-c:a", "aac",
                 "-b:a", "192k",
                 "-y",
                 output_path
             ]
 
+            # Only error text is logged, so stdout is discarded
             result = subprocess.run(
                 cmd,
-                stdout=subprocess.PIPE,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                bufsize=_PIPE_BUFSIZE
             )
 
             if result.returncode != 0:
@@ -209,12 +341,240 @@ class SilenceRemoverService:
 
             logger.info(f"Successfully removed silence from {input_path} -> {output_path}")
 
-            return output_path
+            return output_path, keep_segments
 
         except Exception as e:
             logger.error(f"Error removing silence: {str(e)}")
             raise
 
+    def _video_encoder_args(self) -> Tuple[List[str], List[str], Optional[str]]:
+        """
+        Encoder settings for the re-encode path, using VideoService's selection
+
+        Returns:
+            Tuple of (global args, video output args, upload filter or None)
+        """
+        # Imported here: video_service imports this module
+        from app.services.video_service import video_service
+        return video_service.encoder_args(SILENCE_ENCODE_CRF, SILENCE_ENCODE_PRESET)
+
+    def _get_keyframe_times(self, video_path: str) -> List[float]:
+        """
+        Get video keyframe timestamps using FFprobe (decodes keyframes only)
+
+        Args:
+            video_path: Path to the video file
+
+        Returns:
+            Sorted keyframe times in seconds (empty if probing failed)
+        """
+        cmd = [
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-skip_frame", "nokey",
+            "-show_entries", "frame=pts_time",
+            "-of", "csv=p=0",
+            video_path
+        ]
+
+        result = subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=_PIPE_BUFSIZE
+        )
+        if result.returncode != 0:
+            return []
+
+        keyframes = []
+        for line in result.stdout.splitlines():
+            try:
+                keyframes.append(float(line.strip().rstrip(",")))
+            except ValueError:
+                continue
+        keyframes.sort()
+        return keyframes
+
+    def _snap_to_keyframes(
+        self,
+        video_path: str,
+        keep_segments: List[Tuple[float, float]]
+    ) -> Optional[List[Tuple[float, float]]]:
+        """
+        Move each kept segment's start back to the preceding keyframe
+
+        A start is never moved past the end of the previous kept segment, so
+        snapping cannot overlap or duplicate content when the silence gap is
+        shorter than KEYFRAME_SNAP_TOLERANCE.
+
+        Args:
+            video_path: Path to the video file
+            keep_segments: List of (start, end) tuples
+
+        Returns:
+            Snapped (start, end) tuples, or None if any start is further than
+            KEYFRAME_SNAP_TOLERANCE (or its silence gap) from a keyframe
+        """
+        keyframes = self._get_keyframe_times(video_path)
+        if not keyframes:
+            return None
+
+        snapped = []
+        previous_end = 0.0
+        for start, end in keep_segments:
+            index = bisect.bisect_right(keyframes, start + 1e-3) - 1
+            if index < 0:
+                return None
+            max_shift = min(KEYFRAME_SNAP_TOLERANCE, max(start - previous_end, 0.0))
+            keyframe = min(keyframes[index], start)
+            if start - keyframe > max_shift:
+                return None
+            snapped.append((max(keyframe, 0.0), end))
+            previous_end = end
+        return snapped
+
+    def _concat_copy(
+        self,
+        entries: List[Tuple[str, Optional[float], Optional[float]]],
+        output_path: str
+    ) -> bool:
+        """
+        Join files (or parts of them) with the concat demuxer, without re-encoding
+
+        Args:
+            entries: (path, inpoint, outpoint) tuples; None points mean the whole file
+            output_path: Path to output video
+
+        Returns:
+            True on success, False if FFmpeg failed
+        """
+        list_path = f"{output_path}.concat.txt"
+
+        lines = ["ffconcat version 1.0"]
+        for path, inpoint, outpoint in entries:
+            quoted_path = os.path.abspath(path).replace("'", "'\\''")
+            lines.append(f"file '{quoted_path}'")
+            if inpoint is not None:
+                lines.append(f"inpoint {inpoint}")
+            if outpoint is not None:
+                lines.append(f"outpoint {outpoint}")
+
+        try:
+            with open(list_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+            cmd = [
+                "ffmpeg",
+                "-hide_banner",
+                "-nostats",
+                "-loglevel", "error",
+                "-f", "concat",
+                "-safe", "0",
+                "-i", list_path,
+                "-c", "copy",
+                "-avoid_negative_ts", "make_zero",
+                "-y",
+                output_path
+            ]
+            result = subprocess.run(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=_PIPE_BUFSIZE
+            )
+        finally:
+            if os.path.exists(list_path):
+                os.remove(list_path)
+
+        if result.returncode != 0:
+            logger.warning(f"Concat copy failed: {result.stderr[-500:]}")
+            return False
+        return True
+
+    def _encode_segment(self, input_path: str, start: float, end: float, output_path: str) -> None:
+        """
+        Re-encode one kept segment of the input
+
+        Args:
+            input_path: Path to input video
+            start: Segment start (seconds)
+            end: Segment end (seconds)
+            output_path: Path to the segment file
+
+        Raises:
+            RuntimeError: If FFmpeg fails
+        """
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-loglevel", "error",
+            "-ss", str(start),
+            "-i", input_path,
+            "-t", str(end - start),
+            "-c:v", "libx264",
+            "-preset", SILENCE_ENCODE_PRESET,
+            "-crf", SILENCE_ENCODE_CRF,
+            "-threads", str(SEGMENT_ENCODER_THREADS),
+            "-c:a", "aac",
+            "-b:a", "192k",
+            "-y",
+            output_path
+        ]
+
+        result = subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=_PIPE_BUFSIZE
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"FFmpeg error: {result.stderr}")
+
+    def _encode_segments_parallel(
+        self,
+        input_path: str,
+        keep_segments: List[Tuple[float, float]],
+        output_path: str,
+        max_workers: int
+    ) -> bool:
+        """
+        Encode kept segments in parallel FFmpeg processes, then concat-copy them
+
+        Args:
+            input_path: Path to input video
+            keep_segments: List of (start, end) tuples
+            output_path: Path to output video
+            max_workers: Number of concurrent FFmpeg processes
+
+        Returns:
+            True on success, False if joining the segments failed
+
+        Raises:
+            RuntimeError: If encoding a segment failed
+        """
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_path))) as segment_dir:
+            segment_paths = [
+                os.path.join(segment_dir, f"seg_{i}.mp4") for i in range(len(keep_segments))
+            ]
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._encode_segment, input_path, start, end, segment_path)
+                    for (start, end), segment_path in zip(keep_segments, segment_paths)
+                ]
+                for future in futures:
+                    future.result()
+
+            return self._concat_copy([(path, None, None) for path in segment_paths], output_path)
+
     def _calculate_keep_segments(
         self,
         silence_segments: List[SilenceSegment],
@@ -230,20 +590,17 @@ class SilenceRemoverService:
         Returns:
             List of (start, end) tuples for segments to keep
         """
-        keep_segments = []
-        current_time = 0.0
+        count = len(silence_segments)
+        starts = np.fromiter((s.start for s in silence_segments), dtype=np.float64, count=count)
+        ends = np.fromiter((s.end for s in silence_segments), dtype=np.float64, count=count)
 
-        for silence in silence_segments:
-            # Add segment before this silence
-            if silence.start > current_time:
-                keep_segments.append((current_time, silence.start))
-            current_time = silence.end
+        # Gap i runs from the end of silence i-1 (or 0) to the start of silence i
+        # (or the end of the video); keep only non-empty gaps
+        keep_starts = np.concatenate(([0.0], ends))
+        keep_ends = np.concatenate((starts, [total_duration]))
+        mask = keep_ends > keep_starts
 
-        # Add final segment after last silence
-        if current_time < total_duration:
-            keep_segments.append((current_time, total_duration))
-
-        return keep_segments
+        return list(zip(keep_starts[mask].tolist(), keep_ends[mask].tolist()))
 
     def _build_filter_complex(self, keep_segments: List[Tuple[float, float]]) -> str:
         """
@@ -309,3 +666,94 @@ class SilenceRemoverService:
             "total_duration": round(total_duration, 2),
             "duration_after_removal": round(total_duration - total_silence, 2)
         }
+
+
+# Shared service instances keyed by (noise_threshold, min_silence_duration);
+# bounded because both parameters come from requests
+@lru_cache(maxsize=32)
+def get_silence_remover_service(
+    noise_threshold: str = "-30dB",
+    min_silence_duration: float = 1.0
+) -> SilenceRemoverService:
+    """
+    Get a shared SilenceRemoverService for the given detection parameters
+
+    Args:
+        noise_threshold: Volume threshold for silence (e.g., "-30dB")
+        min_silence_duration: Minimum duration of silence to detect (seconds)
+
+    Returns:
+        SilenceRemoverService instance
+    """
+    return SilenceRemoverService(noise_threshold, min_silence_duration)
+
+
+# Detection results keyed by (path, mtime_ns, size, threshold, min duration)
+_DETECTION_CACHE_SIZE = 256
+_detection_cache: "OrderedDict[Tuple[str, int, int, str, float], Tuple[Tuple[SilenceSegment, ...], float]]" = OrderedDict()
+_detection_cache_lock = threading.Lock()
+
+
+def _detection_cache_key(
+    video_path: str,
+    noise_threshold: str,
+    min_silence_duration: float
+) -> Tuple[str, int, int, str, float]:
+    """Build a cache key; mtime/size are included so edited files miss."""
+    stat = os.stat(video_path)
+    return (video_path, stat.st_mtime_ns, stat.st_size, noise_threshold, min_silence_duration)
+
+
+def cache_silence_result(
+    video_path: str,
+    noise_threshold: str,
+    min_silence_duration: float,
+    silence_segments: List[SilenceSegment],
+    duration: float
+) -> None:
+    """
+    Store a detection result computed elsewhere (e.g. during upload probing)
+
+    Args:
+        video_path: Path to the video file
+        noise_threshold: Volume threshold used for detection
+        min_silence_duration: Minimum silence duration used for detection
+        silence_segments: Detected silence segments
+        duration: Total video duration
+    """
+    key = _detection_cache_key(video_path, noise_threshold, min_silence_duration)
+    with _detection_cache_lock:
+        _detection_cache[key] = (tuple(silence_segments), duration)
+        _detection_cache.move_to_end(key)
+        while len(_detection_cache) > _DETECTION_CACHE_SIZE:
+            _detection_cache.popitem(last=False)
+
+
+def detect_silence_cached(
+    video_path: str,
+    noise_threshold: str = "-30dB",
+    min_silence_duration: float = 1.0
+) -> Tuple[List[SilenceSegment], float]:
+    """
+    Detect silence, reusing results for an unchanged file and parameters
+
+    Args:
+        video_path: Path to the video file
+        noise_threshold: Volume threshold for silence (e.g., "-30dB")
+        min_silence_duration: Minimum duration of silence to detect (seconds)
+
+    Returns:
+        Tuple of (list of silence segments, total video duration)
+    """
+    key = _detection_cache_key(video_path, noise_threshold, min_silence_duration)
+    with _detection_cache_lock:
+        cached = _detection_cache.get(key)
+        if cached is not None:
+            _detection_cache.move_to_end(key)
+            segments, duration = cached
+            return list(segments), duration
+
+    service = get_silence_remover_service(noise_threshold, min_silence_duration)
+    segments, duration = service.detect_silence(video_path)
+    cache_silence_result(video_path, noise_threshold, min_silence_duration, segments, duration)
+    return segments, duration
@@ -3,15 +3,73 @@ Subtitle service for SRT generation and subtitle management.
 Handles conversion of subtitle objects to SRT format and styling.
 """
 
+import heapq
+from functools import lru_cache
+from itertools import zip_longest
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Optional
 import re
 
 from app.models.schemas import Subtitle, SubtitleStyle, SubtitlePosition
-from app.utils.helpers import format_time, color_name_to_hex, hex_to_rgb
+from app.utils.helpers import format_times_bulk, color_name_to_hex, hex_to_rgb
 from app.config import settings
 
 
+# ASS dialogue event line formatter (start, end, style, text)
+_format_ass_dialogue = "Dialogue: 0,{},{},{},,0,0,0,,{}\n".format
+
+# Alignment (ASS uses numpad positions)
+# 1=bottom-left, 2=bottom-center, 3=bottom-right
+# 4=middle-left, 5=middle-center, 6=middle-right
+# 7=top-left, 8=top-center, 9=top-right
+_ASS_ALIGNMENT = {
+    SubtitlePosition.BOTTOM: "2",
+    SubtitlePosition.CENTER: "5",
+    SubtitlePosition.TOP: "8"
+}
+
+# ASS boolean flags (-1 = on)
+_ASS_BOOL = {True: "-1", False: "0"}
+
+# Sort/merge key for subtitles
+_start_time = attrgetter("start_time")
+
+
+def _is_sorted(subtitles: List[Subtitle]) -> bool:
+    """Return True if subtitles are ordered by start time."""
+    return all(a.start_time <= b.start_time for a, b in zip(subtitles, subtitles[1:]))
+
+
+def _sorted_by_start(subtitles: List[Subtitle]) -> List[Subtitle]:
+    """Return subtitles ordered by start time, reusing the list if already ordered."""
+    return subtitles if _is_sorted(subtitles) else sorted(subtitles, key=_start_time)
+
+
+@lru_cache(maxsize=256)
+def _style_name(font_family: str, font_size: int, font_color: str) -> str:
+    """Build an ASS style name from the style fields it depends on."""
+    return f"{font_family.replace(' ', '')}_{font_size}_{font_color.replace('#', '')[:6]}"
+
+
+@lru_cache(maxsize=256)
+def _ass_color(color: str) -> str:
+    """Convert a color name or hex string to ASS format (&HAABBGGRR)."""
+    # Convert color name to hex if needed
+    if not color.startswith("#"):
+        color = color_name_to_hex(color)
+
+    # Convert hex to RGB
+    rgb = hex_to_rgb(color)
+    if not rgb:
+        rgb = (255, 255, 255)  # Default to white
+
+    r, g, b = rgb
+
+    # ASS format is &HAABBGGRR (reversed RGB with alpha)
+    return f"&H00{b:02X}{g:02X}{r:02X}"
+
+
 class SubtitleService:
     """Service for subtitle generation and SRT file creation."""
 
@@ -31,29 +89,23 @@ class SubtitleService:
             Path to generated SRT file
         """
         # Sort subtitles by start time
-        sorted_subtitles = sorted(subtitles, key=lambda s: s.start_time)
-
-        srt_content = []
+        sorted_subtitles = _sorted_by_start(subtitles)
 
-        for idx, subtitle in enumerate(sorted_subtitles, start=1):
-            # Subtitle index
-            srt_content.append(str(idx))
+        # Timestamps (HH:MM:SS,mmm) for all subtitles in one vectorized pass
+        start_times = format_times_bulk([subtitle.start_time for subtitle in sorted_subtitles])
+        end_times = format_times_bulk([subtitle.end_time for subtitle in sorted_subtitles])
 
-            # Timestamp line (HH:MM:SS,mmm --> HH:MM:SS,mmm)
-            start_time = format_time(subtitle.start_time)
-            end_time = format_time(subtitle.end_time)
-            srt_content.append(f"{start_time} --> {end_time}")
-
-            # Subtitle text (with optional styling)
-            styled_text = self._apply_text_styling(subtitle.text, subtitle.style)
-            srt_content.append(styled_text)
-
-            # Blank line between entries
-            srt_content.append("")
-
-        # Write to file
+        # Stream entries straight into the (buffered) file instead of joining one big string
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text("\n".join(srt_content), encoding="utf-8")
+        with output_path.open("w", encoding="utf-8") as f:
+            for idx, (subtitle, start_time, end_time) in enumerate(
+                zip(sorted_subtitles, start_times, end_times), start=1
+            ):
+                # Subtitle text (with optional styling)
+                styled_text = self._apply_text_styling(subtitle.text, subtitle.style)
+
+                # Index, timestamps, text, blank line between entries
+                f.write(f"{idx}\n{start_time} --> {end_time}\n{styled_text}\n\n")
 
         return output_path
 
@@ -78,7 +130,7 @@ class SubtitleService:
             Path to generated ASS file
         """
         # Sort subtitles by start time
-        sorted_subtitles = sorted(subtitles, key=lambda s: s.start_time)
+        sorted_subtitles = _sorted_by_start(subtitles)
 
         # ASS file header
         ass_content = [
@@ -92,8 +144,11 @@ class SubtitleService:
             "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
         ]
 
+        # Style name per subtitle, computed once for the styles and dialogue sections
+        style_names = [self._get_style_name(subtitle.style) for subtitle in sorted_subtitles]
+
         # Create styles for each unique style configuration
-        unique_styles = self._get_unique_styles(sorted_subtitles)
+        unique_styles = self._get_unique_styles(sorted_subtitles, style_names)
         for style_name, style in unique_styles.items():
             ass_content.append(self._create_ass_style(style_name, style, video_height))
 
@@ -104,21 +159,23 @@ class SubtitleService:
             "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
         ])
 
-        # Add dialogue events
-        for subtitle in sorted_subtitles:
-            style_name = self._get_style_name(subtitle.style)
-            start_time = self._format_ass_time(subtitle.start_time)
-            end_time = self._format_ass_time(subtitle.end_time)
-
-            # Clean text (remove SRT formatting tags)
-            text = subtitle.text.replace("\n", "\\N")
-
-            dialogue = f"Dialogue: 0,{start_time},{end_time},{style_name},,0,0,0,,{text}"
-            ass_content.append(dialogue)
-
-        # Write to file
+        # Write header and styles, then stream dialogue events into the buffered file
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text("\n".join(ass_content), encoding="utf-8")
+        with output_path.open("w", encoding="utf-8") as f:
+            f.write("\n".join(ass_content))
+            f.write("\n")
+
+            # Add dialogue events (newlines become ASS hard line breaks)
+            format_ass_time = self._format_ass_time
+            f.writelines(
+                _format_ass_dialogue(
+                    format_ass_time(subtitle.start_time),
+                    format_ass_time(subtitle.end_time),
+                    style_name,
+                    subtitle.text.replace("\n", "\\N")
+                )
+                for style_name, subtitle in zip(style_names, sorted_subtitles)
+            )
 
         return output_path
 
@@ -151,20 +208,20 @@ class SubtitleService:
 
         return styled_text
 
-    def _get_unique_styles(self, subtitles: List[Subtitle]) -> dict:
+    def _get_unique_styles(self, subtitles: List[Subtitle], style_names: List[str]) -> dict:
         """
         Extract unique styles from subtitle list.
 
         Args:
             subtitles: List of subtitles
+            style_names: Style name of each subtitle (same order)
 
         Returns:
             Dictionary of style_name -> SubtitleStyle
         """
         unique_styles = {}
 
-        for subtitle in subtitles:
-            style_name = self._get_style_name(subtitle.style)
+        for style_name, subtitle in zip(style_names, subtitles):
             if style_name not in unique_styles:
                 unique_styles[style_name] = subtitle.style
 
@@ -184,13 +241,8 @@ class SubtitleService:
         Returns:
             Style name string
         """
-        # Create a simple hash-like name based on style properties
-        name_parts = [
-            style.font_family.replace(" ", ""),
-            str(style.font_size),
-            style.font_color.replace("#", "")[:6],
-        ]
-        return "_".join(name_parts)
+        # Create a simple hash-like name based on style properties (memoized)
+        return _style_name(style.font_family, style.font_size, style.font_color)
 
     def _create_ass_style(
         self,
@@ -220,19 +272,11 @@ class SubtitleService:
         shadow_color = "&H80000000"   # Semi-transparent black shadow
 
         # Bold and italic
-        bold = "-1" if style.bold else "0"
-        italic = "-1" if style.italic else "0"
+        bold = _ASS_BOOL[bool(style.bold)]
+        italic = _ASS_BOOL[bool(style.italic)]
 
         # Alignment (ASS uses numpad positions)
-        # 1=bottom-left, 2=bottom-center, 3=bottom-right
-        # 4=middle-left, 5=middle-center, 6=middle-right
-        # 7=top-left, 8=top-center, 9=top-right
-        alignment_map = {
-            SubtitlePosition.BOTTOM: "2",
-            SubtitlePosition.CENTER: "5",
-            SubtitlePosition.TOP: "8"
-        }
-        alignment = alignment_map.get(style.position, "2")
+        alignment = _ASS_ALIGNMENT.get(style.position, "2")
 
         # Margin from bottom
         margin_v = "20"  # pixels from edge
@@ -258,19 +302,8 @@ class SubtitleService:
         Returns:
             ASS color format string
         """
-        # Convert color name to hex if needed
-        if not color.startswith("#"):
-            color = color_name_to_hex(color)
-
-        # Convert hex to RGB
-        rgb = hex_to_rgb(color)
-        if not rgb:
-            rgb = (255, 255, 255)  # Default to white
-
-        r, g, b = rgb
-
-        # ASS format is &HAABBGGRR (reversed RGB with alpha)
-        return f"&H00{b:02X}{g:02X}{r:02X}"
+        # Styles share few distinct colors, so the conversion is memoized
+        return _ass_color(color)
 
     def _format_ass_time(self, seconds: float) -> str:
         """
@@ -282,10 +315,10 @@ class SubtitleService:
         Returns:
             ASS formatted time string
         """
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        centiseconds = int((seconds % 1) * 100)
+        # Round once to whole centiseconds, then split with integer divmods
+        secs, centiseconds = divmod(round(seconds * 100), 100)
+        minutes, secs = divmod(secs, 60)
+        hours, minutes = divmod(minutes, 60)
 
         return f"{hours}:{minutes:02d}:{secs:02d}.{centiseconds:02d}"
 
@@ -302,28 +335,30 @@ class SubtitleService:
         errors = []
 
         # Sort by start time
-        sorted_subs = sorted(subtitles, key=lambda s: s.start_time)
+        sorted_subs = _sorted_by_start(subtitles)
+
+        # Walk each subtitle alongside its successor (None for the last one)
+        for sub, next_sub in zip_longest(sorted_subs, sorted_subs[1:]):
+            start_time = sub.start_time
+            end_time = sub.end_time
 
-        for i, sub in enumerate(sorted_subs):
             # Check if end time is after start time
-            if sub.end_time <= sub.start_time:
+            if end_time <= start_time:
                 errors.append(
-                    f"Subtitle {sub.id}: End time ({sub.end_time}) must be after start time ({sub.start_time})"
+                    f"Subtitle {sub.id}: End time ({end_time}) must be after start time ({start_time})"
                 )
 
             # Check for negative times
-            if sub.start_time < 0 or sub.end_time < 0:
+            if start_time < 0 or end_time < 0:
                 errors.append(
                     f"Subtitle {sub.id}: Times cannot be negative"
                 )
 
             # Check for overlaps with next subtitle
-            if i < len(sorted_subs) - 1:
-                next_sub = sorted_subs[i + 1]
-                if sub.end_time > next_sub.start_time:
-                    errors.append(
-                        f"Subtitle {sub.id} overlaps with {next_sub.id}"
-                    )
+            if next_sub is not None and end_time > next_sub.start_time:
+                errors.append(
+                    f"Subtitle {sub.id} overlaps with {next_sub.id}"
+                )
 
         return errors
 
@@ -335,6 +370,10 @@ class SubtitleService:
         """
         Merge new subtitles with existing ones, avoiding duplicates.
 
+        When both lists are already sorted by start time (the usual case, since
+        sessions keep subtitles ordered) they are heap-merged in linear time;
+        otherwise the merged set is sorted.
+
         Args:
             existing: Existing subtitle list
             new: New subtitles to add
@@ -342,15 +381,16 @@ class SubtitleService:
         Returns:
             Merged subtitle list
         """
-        # Create a dictionary for quick lookup by ID
-        merged = {sub.id: sub for sub in existing}
+        # New subtitles replace existing ones with the same ID
+        replacements = {sub.id: sub for sub in new}
+        kept = [sub for sub in existing if sub.id not in replacements]
+        added = list(replacements.values())
 
-        # Add or update with new subtitles
-        for sub in new:
-            merged[sub.id] = sub
+        if _is_sorted(kept) and _is_sorted(added):
+            return list(heapq.merge(kept, added, key=_start_time))
 
         # Return as sorted list
-        return sorted(merged.values(), key=lambda s: s.start_time)
+        return sorted(kept + added, key=_start_time)
 
     def create_default_style(self) -> SubtitleStyle:
         """
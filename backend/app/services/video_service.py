@@ -3,16 +3,61 @@ Video processing service using FFmpeg.
 Handles video metadata extraction, validation, and processing.
 """
 
-import ffmpeg
+import asyncio
 import subprocess
+import threading
 import json
+import re
+import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Callable, List
+
+# Faster JSON parsing for ffprobe output when orjson is installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 from app.config import settings
 from app.models.schemas import VideoMetadata
+from app.services.silence_remover_service import SilenceSegment, get_silence_remover_service
 from app.utils.helpers import validate_video_file
 
+logger = logging.getLogger(__name__)
+
+# Patterns for the input header FFmpeg prints to stderr
+_INPUT_FORMAT_PATTERN = re.compile(r"^Input #0, (.+?), from ", re.MULTILINE)
+_DURATION_PATTERN = re.compile(r"Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+_VIDEO_STREAM_PATTERN = re.compile(r"Stream #0:\d+.*?: Video: (\w+)(.*)")
+_AUDIO_STREAM_PATTERN = re.compile(r"Stream #0:\d+.*?: Audio: ")
+_RESOLUTION_PATTERN = re.compile(r"\b(\d{2,5})x(\d{2,5})\b")
+_FPS_PATTERN = re.compile(r"(\d+(?:\.\d+)?) (?:fps|tbr)")
+
+# Video encoders listed by `ffmpeg -encoders` (lines like " V....D libx264  ...")
+_ENCODER_LINE_PATTERN = re.compile(r"^\s*V[A-Z.]{5}\s+(\S+)", re.MULTILINE)
+
+# Hardware H.264 encoders, in order of preference
+_HW_ENCODERS = ('h264_nvenc', 'h264_qsv', 'h264_vaapi', 'h264_videotoolbox')
+
+# (crf, libx264 preset) per quality level
+_QUALITY_LEVELS = {
+    'high': ('18', 'slow'),
+    'medium': ('23', 'medium'),
+    'low': ('28', 'fast')
+}
+
+# NVENC preset (p1 fastest .. p7 best) per libx264 preset
+_NVENC_PRESETS = {
+    'slow': 'p6',
+    'medium': 'p5',
+    'fast': 'p3'
+}
+
+# Maximum number of ffprobe results kept in memory
+PROBE_CACHE_SIZE = 128
+
 
 class VideoProcessingError(Exception):
     """Custom exception for video processing errors."""
@@ -24,6 +69,14 @@ class VideoService:
 
     def __init__(self):
         self._verify_ffmpeg_installation()
+        # Encoder and its quality arguments are chosen on first use, so importing
+        # the app doesn't run FFmpeg test encodes
+        self._video_encoder: Optional[str] = None
+        self._quality_settings: Optional[List[str]] = None
+        self._encoder_lock = threading.Lock()
+        # ffprobe results keyed by (path, mtime_ns, size), least recently used first
+        self._probe_cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+        self._probe_cache_lock = threading.Lock()
 
     def _verify_ffmpeg_installation(self):
         """Verify FFmpeg is installed and accessible."""
@@ -40,6 +93,193 @@ class VideoService:
                 "Please install FFmpeg: https://ffmpeg.org/download.html"
             )
 
+    @property
+    def video_encoder(self) -> str:
+        """H.264 encoder used for re-encoding (selected on first access)."""
+        if self._video_encoder is None:
+            with self._encoder_lock:
+                if self._video_encoder is None:
+                    self._video_encoder = self._select_video_encoder()
+        return self._video_encoder
+
+    def _select_video_encoder(self) -> str:
+        """
+        Pick the H.264 encoder used for re-encoding.
+
+        With `video_encoder = "auto"`, the first hardware encoder that is both
+        compiled into FFmpeg and able to encode a test frame is used; listed
+        encoders may still lack a usable device or driver.
+
+        Returns:
+            FFmpeg encoder name (falls back to libx264)
+        """
+        configured = settings.video_encoder.lower()
+        if configured != 'auto':
+            return configured
+
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-encoders"],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+        except (subprocess.CalledProcessError, OSError):
+            return 'libx264'
+
+        available = set(_ENCODER_LINE_PATTERN.findall(result.stdout))
+        for encoder in _HW_ENCODERS:
+            if encoder in available and self._encoder_works(encoder):
+                logger.info(f"Using hardware video encoder: {encoder}")
+                return encoder
+
+        return 'libx264'
+
+    def _encoder_works(self, encoder: str) -> bool:
+        """Encode a single synthetic frame to check the encoder is usable."""
+        cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error"]
+        cmd += self._encoder_global_args(encoder)
+        cmd += ["-f", "lavfi", "-i", "color=size=256x256:duration=0.1", "-frames:v", "1"]
+        video_filter = self._video_filter(None, encoder)
+        if video_filter:
+            cmd += ["-vf", video_filter]
+        cmd += ["-c:v", encoder, "-f", "null", "-"]
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, timeout=15)
+        except (subprocess.TimeoutExpired, OSError):
+            return False
+        return result.returncode == 0
+
+    def _encoder_global_args(self, encoder: Optional[str] = None) -> List[str]:
+        """Global FFmpeg arguments required by an encoder."""
+        encoder = encoder or self.video_encoder
+        if encoder == 'h264_vaapi':
+            return ['-vaapi_device', settings.vaapi_device]
+        return []
+
+    def _video_filter(self, base_filter: Optional[str], encoder: Optional[str] = None) -> Optional[str]:
+        """
+        Append the upload step VAAPI needs to a video filter chain.
+
+        Args:
+            base_filter: Existing filter chain, or None
+            encoder: Encoder name (defaults to the selected encoder)
+
+        Returns:
+            Filter chain to pass as `-vf`, or None if no filter is needed
+        """
+        encoder = encoder or self.video_encoder
+        if encoder != 'h264_vaapi':
+            return base_filter
+        upload = "format=nv12,hwupload"
+        return f"{base_filter},{upload}" if base_filter else upload
+
+    def _encoder_options(self, crf: str, preset: str) -> Dict[str, Any]:
+        """
+        Output options for the selected encoder.
+
+        Args:
+            crf: libx264 CRF value; reused as the hardware encoders' quality level
+            preset: libx264 preset
+
+        Returns:
+            Dictionary of FFmpeg output parameters
+        """
+        encoder = self.video_encoder
+
+        if encoder == 'h264_nvenc':
+            return {
+                'vcodec': encoder,
+                'preset': _NVENC_PRESETS.get(preset, 'p5'),
+                'tune': 'hq',
+                'rc': 'vbr',
+                'cq': crf
+            }
+        if encoder == 'h264_qsv':
+            # QSV accepts the libx264 preset names
+            return {'vcodec': encoder, 'preset': preset, 'global_quality': crf}
+        if encoder == 'h264_vaapi':
+            return {'vcodec': encoder, 'qp': crf}
+        if encoder == 'h264_videotoolbox':
+            # VideoToolbox quality is 1-100 (higher is better)
+            return {'vcodec': encoder, 'q:v': str(max(1, 100 - 2 * int(crf)))}
+
+        return {
+            'vcodec': encoder,
+            'crf': crf,
+            'preset': preset,
+            'threads': str(settings.ffmpeg_threads)
+        }
+
+    def encoder_args(self, crf: str, preset: str) -> Tuple[List[str], List[str], Optional[str]]:
+        """
+        Selected encoder settings for FFmpeg commands built as argument lists.
+
+        Args:
+            crf: libx264 CRF value; reused as the hardware encoders' quality level
+            preset: libx264 preset
+
+        Returns:
+            Tuple of (global args placed before -i, video output args,
+            filter to append to the video chain or None)
+        """
+        output_args = []
+        for key, value in self._encoder_options(crf, preset).items():
+            output_args += ['-c:v' if key == 'vcodec' else f'-{key}', str(value)]
+        return self._encoder_global_args(), output_args, self._video_filter(None)
+
+    def _cached_probe(self, video_path: Path) -> Dict[str, Any]:
+        """
+        Run ffprobe on a file, reusing the result while the file is unchanged.
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            ffprobe result dictionary (shared; do not mutate)
+
+        Raises:
+            subprocess.CalledProcessError: If ffprobe fails
+        """
+        stat = video_path.stat()
+        key = (str(video_path), stat.st_mtime_ns, stat.st_size)
+
+        with self._probe_cache_lock:
+            probe = self._probe_cache.get(key)
+            if probe is not None:
+                self._probe_cache.move_to_end(key)
+                return probe
+
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v", "error",
+                "-print_format", "json",
+                "-show_format",
+                "-show_streams",
+                str(video_path)
+            ],
+            stdin=subprocess.DEVNULL,
+            capture_output=True
+        )
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(
+                result.returncode,
+                result.args,
+                stderr=result.stderr.decode(errors="replace")
+            )
+        # Parse the raw bytes directly (orjson when installed)
+        probe = _json_loads(result.stdout)
+
+        with self._probe_cache_lock:
+            self._probe_cache[key] = probe
+            self._probe_cache.move_to_end(key)
+            while len(self._probe_cache) > PROBE_CACHE_SIZE:
+                self._probe_cache.popitem(last=False)
+
+        return probe
+
     def extract_metadata(self, video_path: Path) -> VideoMetadata:
         """
         Extract video metadata using FFmpeg probe.
@@ -58,9 +298,24 @@ class VideoService:
         if not is_valid:
             raise VideoProcessingError(f"Invalid video file: {error_msg}")
 
+        return self._extract_metadata_unchecked(video_path)
+
+    def _extract_metadata_unchecked(self, video_path: Path) -> VideoMetadata:
+        """
+        Extract video metadata for a file that already passed validate_video_file.
+
+        Args:
+            video_path: Path to video file
+
+        Returns:
+            VideoMetadata object
+
+        Raises:
+            VideoProcessingError: If metadata extraction fails
+        """
         try:
             # Use ffprobe to get video information
-            probe = ffmpeg.probe(str(video_path))
+            probe = self._cached_probe(video_path)
 
             # Find video stream
             video_stream = next(
@@ -88,6 +343,9 @@ class VideoService:
             # Get file size
             file_size = video_path.stat().st_size
 
+            # Check for an audio stream
+            has_audio = any(stream['codec_type'] == 'audio' for stream in probe['streams'])
+
             return VideoMetadata(
                 filename=video_path.name,
                 duration=duration,
@@ -95,15 +353,146 @@ class VideoService:
                 height=height,
                 fps=fps,
                 format=f"{video_format} ({codec})",
-                size=file_size
+                size=file_size,
+                has_audio=has_audio
             )
 
-        except ffmpeg.Error as e:
-            error_message = e.stderr.decode() if e.stderr else str(e)
-            raise VideoProcessingError(f"FFmpeg error: {error_message}")
+        except subprocess.CalledProcessError as e:
+            raise VideoProcessingError(f"FFmpeg error: {e.stderr or str(e)}")
         except Exception as e:
             raise VideoProcessingError(f"Failed to extract metadata: {str(e)}")
 
+    def probe_and_detect_silence(
+        self,
+        video_path: Path,
+        noise_threshold: str = "-30dB",
+        min_silence_duration: float = 1.0
+    ) -> Tuple[VideoMetadata, Optional[List[SilenceSegment]], float]:
+        """
+        Extract metadata and detect silence with a single FFmpeg pass.
+
+        Runs `ffmpeg -i input -af silencedetect -f null -` once and parses both
+        the input header and the silencedetect lines from stderr, instead of a
+        separate ffprobe + ffmpeg invocation over the same file.
+
+        Args:
+            video_path: Path to video file
+            noise_threshold: Volume threshold for silence (e.g., "-30dB")
+            min_silence_duration: Minimum duration of silence to detect (seconds)
+
+        Returns:
+            Tuple of (VideoMetadata, list of silence segments, total duration).
+            Segments are None if metadata was read but silence detection failed.
+
+        Raises:
+            VideoProcessingError: If the file is invalid or unreadable
+        """
+        # Validate file first
+        is_valid, error_msg = validate_video_file(video_path)
+        if not is_valid:
+            raise VideoProcessingError(f"Invalid video file: {error_msg}")
+
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-i", str(video_path),
+            "-vn",
+            "-af", f"silencedetect=noise={noise_threshold}:d={min_silence_duration}",
+            "-f", "null",
+            "-"
+        ]
+
+        try:
+            result = subprocess.run(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                errors="replace"
+            )
+        except OSError as e:
+            raise VideoProcessingError(f"Failed to run FFmpeg: {str(e)}")
+
+        header = self._parse_input_header(result.stderr, video_path)
+        if header is None:
+            # Header not understood (or FFmpeg failed early): fall back to ffprobe
+            # (file was validated above)
+            metadata = self._extract_metadata_unchecked(video_path)
+            if not metadata.has_audio:
+                return metadata, [], metadata.duration
+            silence_service = get_silence_remover_service(noise_threshold, min_silence_duration)
+            try:
+                silence_segments, duration = silence_service.detect_silence(str(video_path))
+            except Exception as e:
+                # Metadata is usable; silence detection is non-critical
+                logger.warning(f"Silence detection failed for {video_path}: {str(e)}")
+                return metadata, None, metadata.duration
+            return metadata, silence_segments, duration
+
+        metadata = header
+
+        if not metadata.has_audio:
+            # Nothing to detect; FFmpeg exits non-zero when no output stream remains
+            return metadata, [], metadata.duration
+
+        if result.returncode != 0:
+            # Metadata is usable; only silence detection failed
+            logger.warning(f"Silence detection failed for {video_path}: {result.stderr[-500:]}")
+            return metadata, None, metadata.duration
+
+        silence_service = get_silence_remover_service(noise_threshold, min_silence_duration)
+        silence_segments = silence_service.parse_silence_output(result.stderr)
+
+        return metadata, silence_segments, metadata.duration
+
+    def _parse_input_header(
+        self,
+        output: str,
+        video_path: Path
+    ) -> Optional[VideoMetadata]:
+        """
+        Parse the input section of FFmpeg's stderr into metadata.
+
+        Args:
+            output: FFmpeg stderr output
+            video_path: Path to the probed video file
+
+        Returns:
+            VideoMetadata, or None if the header could not be parsed
+        """
+        # Only look at the input section; output streams are listed after the mapping
+        input_section = output.split("Stream mapping:", 1)[0]
+
+        format_match = _INPUT_FORMAT_PATTERN.search(input_section)
+        duration_match = _DURATION_PATTERN.search(input_section)
+        video_match = _VIDEO_STREAM_PATTERN.search(input_section)
+        if not (format_match and duration_match and video_match):
+            return None
+
+        codec, stream_details = video_match.groups()
+        resolution_match = _RESOLUTION_PATTERN.search(stream_details)
+        fps_match = _FPS_PATTERN.search(stream_details)
+        if not (resolution_match and fps_match):
+            return None
+
+        hours, minutes, seconds = duration_match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+        try:
+            return VideoMetadata(
+                filename=video_path.name,
+                duration=duration,
+                width=int(resolution_match.group(1)),
+                height=int(resolution_match.group(2)),
+                fps=float(fps_match.group(1)),
+                format=f"{format_match.group(1)} ({codec})",
+                size=video_path.stat().st_size,
+                has_audio=_AUDIO_STREAM_PATTERN.search(input_section) is not None
+            )
+        except ValueError:
+            return None
+
     def get_video_info(self, video_path: Path) -> Dict[str, Any]:
         """
         Get detailed video information using ffprobe.
@@ -115,9 +504,9 @@ class VideoService:
             Dictionary with detailed video information
         """
         try:
-            probe = ffmpeg.probe(str(video_path))
+            probe = self._cached_probe(video_path)
             return probe
-        except ffmpeg.Error as e:
+        except (subprocess.CalledProcessError, OSError, ValueError) as e:
             raise VideoProcessingError(f"Failed to get video info: {str(e)}")
 
     def validate_video(self, video_path: Path) -> Tuple[bool, Optional[str]]:
@@ -135,9 +524,9 @@ class VideoService:
         if not is_valid:
             return False, error_msg
 
-        # Try to extract metadata to ensure file is readable
+        # Try to extract metadata to ensure file is readable (already validated above)
         try:
-            self.extract_metadata(video_path)
+            self._extract_metadata_unchecked(video_path)
             return True, None
         except VideoProcessingError as e:
             return False, str(e)
@@ -153,7 +542,7 @@ class VideoService:
             Duration in seconds
         """
         try:
-            probe = ffmpeg.probe(str(video_path))
+            probe = self._cached_probe(video_path)
             duration = float(probe['format']['duration'])
             return duration
         except Exception as e:
@@ -176,20 +565,21 @@ class VideoService:
         Returns:
             Path to generated thumbnail
         """
+        cmd = [
+            "ffmpeg", "-hide_banner", "-nostats", "-y",
+            "-ss", str(timestamp),
+            "-i", str(video_path),
+            "-frames:v", "1",
+            str(output_path)
+        ]
+
         try:
-            (
-                ffmpeg
-                .input(str(video_path), ss=timestamp)
-                .output(str(output_path), vframes=1)
-                .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
-            )
+            self._run_ffmpeg(cmd)
             return output_path
-        except ffmpeg.Error as e:
-            error_message = e.stderr.decode() if e.stderr else str(e)
-            raise VideoProcessingError(f"Failed to generate thumbnail: {error_message}")
+        except subprocess.CalledProcessError as e:
+            raise VideoProcessingError(f"Failed to generate thumbnail: {e.stderr or str(e)}")
 
-    def create_preview_clip(
+    async def create_preview_clip_async(
         self,
         video_path: Path,
         output_path: Path,
@@ -197,7 +587,9 @@ class VideoService:
         duration: float = 10.0
     ) -> Path:
         """
-        Create a short preview clip from video.
+        Create a short preview clip without blocking the event loop.
+
+        FFmpeg runs as an asyncio subprocess.
 
         Args:
             video_path: Path to video file
@@ -208,37 +600,51 @@ class VideoService:
         Returns:
             Path to generated preview
         """
+        cmd = self._preview_clip_cmd(video_path, output_path, start_time, duration)
+
         try:
-            (
-                ffmpeg
-                .input(str(video_path), ss=start_time, t=duration)
-                .output(
-                    str(output_path),
-                    vcodec='libx264',
-                    acodec='aac',
-                    **{'crf': '23', 'preset': 'fast'}
-                )
-                .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
-            )
+            await self._run_ffmpeg_async(cmd)
             return output_path
-        except ffmpeg.Error as e:
-            error_message = e.stderr.decode() if e.stderr else str(e)
-            raise VideoProcessingError(f"Failed to create preview: {error_message}")
+        except subprocess.CalledProcessError as e:
+            raise VideoProcessingError(f"Failed to create preview: {e.stderr or str(e)}")
 
-    def burn_subtitles(
+    def _preview_clip_cmd(
+        self,
+        video_path: Path,
+        output_path: Path,
+        start_time: float,
+        duration: float
+    ) -> List[str]:
+        """Build the FFmpeg command for a preview clip."""
+        global_args, video_args, video_filter = self.encoder_args('23', 'fast')
+
+        cmd = ["ffmpeg", "-hide_banner", "-nostats", "-y"] + global_args
+        cmd += ["-ss", str(start_time), "-t", str(duration), "-i", str(video_path)]
+        if video_filter:
+            cmd += ["-vf", video_filter]
+        cmd += ["-c:a", "aac"] + video_args + [str(output_path)]
+        return cmd
+
+    async def burn_subtitles_async(
         self,
         video_path: Path,
         subtitle_path: Path,
-        output_path: Path
+        output_path: Path,
+        duration: Optional[float] = None,
+        progress_callback: Optional[Callable[[float], None]] = None
     ) -> Path:
         """
-        Burn subtitles into video file.
+        Burn subtitles into video file without blocking the event loop.
+
+        FFmpeg runs as an asyncio subprocess, so no worker thread is held
+        for the length of the encode.
 
         Args:
             video_path: Path to input video
             subtitle_path: Path to SRT subtitle file
             output_path: Path for output video
+            duration: Video duration in seconds, used to compute progress
+            progress_callback: Optional callable receiving percent complete
 
         Returns:
             Path to output video with burned subtitles
@@ -246,69 +652,164 @@ class VideoService:
         Raises:
             VideoProcessingError: If subtitle burning fails
         """
+        cmd = self._burn_subtitles_cmd(video_path, subtitle_path, output_path)
+
         try:
-            # Get video quality settings
-            quality_settings = self._get_quality_settings()
-
-            # Convert Windows path to forward slashes and escape for FFmpeg
-            # FFmpeg accepts forward slashes on all platforms including Windows
-            subtitle_path_str = str(subtitle_path).replace('\\', '/')
-            # Escape special characters for FFmpeg filter
-            subtitle_path_escaped = subtitle_path_str.replace(':', '\\:')
-
-            # Build FFmpeg command to burn subtitles
-            (
-                ffmpeg
-                .input(str(video_path))
-                .output(
-                    str(output_path),
-                    vf=f"subtitles='{subtitle_path_escaped}'",
-                    **quality_settings
-                )
-                .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
-            )
+            if progress_callback and duration:
+                await self._run_ffmpeg_async(cmd, duration, progress_callback)
+            else:
+                await self._run_ffmpeg_async(cmd)
 
             return output_path
 
-        except ffmpeg.Error as e:
-            error_message = e.stderr.decode() if e.stderr else str(e)
-            raise VideoProcessingError(f"Failed to burn subtitles: {error_message}")
+        except subprocess.CalledProcessError as e:
+            raise VideoProcessingError(f"Failed to burn subtitles: {e.stderr or str(e)}")
+
+    def _burn_subtitles_cmd(
+        self,
+        video_path: Path,
+        subtitle_path: Path,
+        output_path: Path
+    ) -> List[str]:
+        """Build the FFmpeg command to burn subtitles."""
+        cmd = ["ffmpeg", "-hide_banner", "-nostats", "-y"] + self._encoder_global_args()
+        cmd += [
+            "-i", str(video_path),
+            "-vf", self._video_filter(self._subtitles_filter(subtitle_path))
+        ]
+        # Get video quality settings
+        cmd += self._get_quality_settings() + [str(output_path)]
+        return cmd
+
+    def _subtitles_filter(self, subtitle_path: Path) -> str:
+        """
+        Build the `subtitles` filter for a subtitle file.
+
+        Args:
+            subtitle_path: Path to SRT/ASS subtitle file
+
+        Returns:
+            Filter string with the path escaped for FFmpeg
+        """
+        # Convert Windows path to forward slashes and escape for FFmpeg
+        # FFmpeg accepts forward slashes on all platforms including Windows
+        subtitle_path_str = str(subtitle_path).replace('\\', '/')
+        # Escape special characters for FFmpeg filter
+        subtitle_path_escaped = subtitle_path_str.replace(':', '\\:')
+        return f"subtitles='{subtitle_path_escaped}'"
+
+    def _run_ffmpeg(self, cmd: List[str]) -> None:
+        """
+        Run an FFmpeg command to completion.
 
-    def _get_quality_settings(self) -> Dict[str, Any]:
+        Args:
+            cmd: FFmpeg argument list
+
+        Raises:
+            subprocess.CalledProcessError: If FFmpeg exits with a non-zero status
+                (stderr holds FFmpeg's log)
+        """
+        subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+            check=True
+        )
+
+    async def _run_ffmpeg_async(
+        self,
+        cmd: List[str],
+        duration: Optional[float] = None,
+        progress_callback: Optional[Callable[[float], None]] = None
+    ) -> None:
+        """
+        Run an FFmpeg command as an asyncio subprocess.
+
+        With a duration and progress callback, progress is parsed from
+        `-progress pipe:1`. If the calling task is cancelled, FFmpeg is
+        killed before the cancellation propagates.
+
+        Args:
+            cmd: FFmpeg argument list
+            duration: Input duration in seconds
+            progress_callback: Optional callable receiving percent complete
+
+        Raises:
+            subprocess.CalledProcessError: If FFmpeg exits with a non-zero status
+        """
+        track_progress = bool(progress_callback and duration)
+        args = [cmd[0], "-progress", "pipe:1", "-nostats"] + cmd[1:] if track_progress else cmd
+
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE if track_progress else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+
+        # Drain stderr concurrently so a full pipe can't stall FFmpeg
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+
+        try:
+            if track_progress:
+                async for raw_line in process.stdout:
+                    self._report_progress(raw_line, duration, progress_callback)
+
+            await process.wait()
+        except asyncio.CancelledError:
+            # Don't leave FFmpeg running (and writing output) after cancellation
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+            stderr_task.cancel()
+            raise
+
+        stderr = (await stderr_task).decode(errors="replace")
+
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr)
+
+    @staticmethod
+    def _report_progress(
+        raw_line: bytes,
+        duration: float,
+        progress_callback: Callable[[float], None]
+    ) -> None:
+        """Pass one `-progress` output line to the progress callback."""
+        key, _, value = raw_line.decode(errors="ignore").strip().partition("=")
+        # out_time_ms is reported in microseconds despite its name
+        if key in ("out_time_us", "out_time_ms") and value.isdigit():
+            progress_callback(int(value) / 1_000_000 / duration * 100)
+        elif key == "progress" and value == "end":
+            progress_callback(100.0)
+
+    def _get_quality_settings(self) -> List[str]:
         """
         Get FFmpeg quality settings based on configuration.
 
         Returns:
-            Dictionary of FFmpeg output parameters
+            FFmpeg output arguments (audio and video codec settings)
         """
-        quality = settings.video_quality.lower()
+        if self._quality_settings is None:
+            # Fixed once the encoder is chosen
+            _, video_args, _ = self.encoder_args(*self._quality_level())
+            self._quality_settings = ['-c:a', 'aac'] + video_args
+        return self._quality_settings
 
-        settings_map = {
-            'high': {
-                'vcodec': 'libx264',
-                'acodec': 'aac',
-                'crf': '18',
-                'preset': 'slow',
-                'threads': str(settings.ffmpeg_threads)
-            },
-            'medium': {
-                'vcodec': 'libx264',
-                'acodec': 'aac',
-                'crf': '23',
-                'preset': 'medium',
-                'threads': str(settings.ffmpeg_threads)
-            },
-            'low': {
-                'vcodec': 'libx264',
-                'acodec': 'aac',
-                'crf': '28',
-                'preset': 'fast',
-                'threads': str(settings.ffmpeg_threads)
-            }
-        }
+    def _quality_level(self) -> Tuple[str, str]:
+        """
+        Get the (crf, libx264 preset) pair for the configured video quality.
 
-        return settings_map.get(quality, settings_map['medium'])
+        Returns:
+            Tuple of (crf, preset)
+        """
+        quality = settings.video_quality.lower()
+        return _QUALITY_LEVELS.get(quality, _QUALITY_LEVELS['medium'])
 
     def get_resolution(self, video_path: Path) -> Tuple[int, int]:
         """
@@ -321,7 +822,7 @@ class VideoService:
             Tuple of (width, height)
         """
         try:
-            probe = ffmpeg.probe(str(video_path))
+            probe = self._cached_probe(video_path)
             video_stream = next(
                 (stream for stream in probe['streams'] if stream['codec_type'] == 'video'),
                 None
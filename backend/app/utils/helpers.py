@@ -4,8 +4,74 @@ Utility helper functions for the backend.
 
 import uuid
 import re
+import stat
+import hashlib
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple
+from types import MappingProxyType
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Optional JIT compilation of the bulk time formatting kernel
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Compiled patterns for sanitize_filename
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w\s.-]')
+_FILENAME_WHITESPACE = re.compile(r'\s+')
+
+# "<number> <unit>" tokens for parse_time_string (e.g. "1 hour", "30s", "2.5 minutes")
+_TIME_TOKEN_PATTERN = re.compile(
+    r'(\d+(?:\.\d+)?)\s*(hours?|hrs?|h|minutes?|mins?|m|seconds?|secs?|s)(?![a-z])'
+)
+# Seconds per unit, keyed by the unit's first letter
+_TIME_UNIT_SECONDS = {'h': 3600, 'm': 60, 's': 1}
+
+# Named colors accepted in subtitle styles (read-only)
+_COLOR_MAP = MappingProxyType({
+    'white': '#FFFFFF',
+    'black': '#000000',
+    'red': '#FF0000',
+    'green': '#00FF00',
+    'blue': '#0000FF',
+    'yellow': '#FFFF00',
+    'cyan': '#00FFFF',
+    'magenta': '#FF00FF',
+    'orange': '#FFA500',
+    'purple': '#800080',
+    'pink': '#FFC0CB',
+    'brown': '#A52A2A',
+    'gray': '#808080',
+    'grey': '#808080',
+})
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _split_milliseconds(milliseconds):
+        """Split millisecond counts into (hours, minutes, seconds, milliseconds) rows."""
+        parts = np.empty((milliseconds.shape[0], 4), dtype=np.int64)
+        for i in range(milliseconds.shape[0]):
+            secs, ms = divmod(milliseconds[i], 1000)
+            minutes, secs = divmod(secs, 60)
+            hours, minutes = divmod(minutes, 60)
+            parts[i, 0] = hours
+            parts[i, 1] = minutes
+            parts[i, 2] = secs
+            parts[i, 3] = ms
+        return parts
+else:
+    def _split_milliseconds(milliseconds):
+        """Split millisecond counts into (hours, minutes, seconds, milliseconds) rows."""
+        secs, ms = np.divmod(milliseconds, 1000)
+        minutes, secs = np.divmod(secs, 60)
+        hours, minutes = np.divmod(minutes, 60)
+        return np.stack((hours, minutes, secs, ms), axis=1)
 
 
 def generate_id(prefix: str = "") -> str:
@@ -24,14 +90,36 @@ def format_time(seconds: float) -> str:
     Returns:
         Formatted time string
     """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    milliseconds = int((seconds % 1) * 1000)
+    # Round once to whole milliseconds, then split with integer divmods
+    secs, milliseconds = divmod(round(seconds * 1000), 1000)
+    minutes, secs = divmod(secs, 60)
+    hours, minutes = divmod(minutes, 60)
 
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
 
 
+def format_times_bulk(seconds: Sequence[float]) -> List[str]:
+    """
+    Format many times to SRT time format (HH:MM:SS,mmm) at once.
+
+    Same output as format_time, with the arithmetic done on a NumPy array
+    (JIT-compiled with Numba when installed).
+
+    Args:
+        seconds: Times in seconds
+
+    Returns:
+        Formatted time strings, in input order
+    """
+    milliseconds = np.rint(np.asarray(seconds, dtype=np.float64) * 1000).astype(np.int64)
+
+    return [
+        f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+        for h, m, s, ms in _split_milliseconds(milliseconds).tolist()
+    ]
+
+
+@lru_cache(maxsize=1024)
 def parse_time_string(time_str: str) -> Optional[float]:
     """
     Parse natural language time string to seconds.
@@ -63,23 +151,11 @@ def parse_time_string(time_str: str) -> Optional[float]:
         except ValueError:
             pass
 
-    # Try natural language parsing
+    # Try natural language parsing: one left-to-right scan over "<number> <unit>" tokens
     total_seconds = 0.0
-
-    # Extract hours
-    hours_match = re.search(r'(\d+)\s*(?:hour|hr|h)', time_str)
-    if hours_match:
-        total_seconds += float(hours_match.group(1)) * 3600
-
-    # Extract minutes
-    minutes_match = re.search(r'(\d+)\s*(?:minute|min|m)', time_str)
-    if minutes_match:
-        total_seconds += float(minutes_match.group(1)) * 60
-
-    # Extract seconds
-    seconds_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:second|sec|s)', time_str)
-    if seconds_match:
-        total_seconds += float(seconds_match.group(1))
+    for match in _TIME_TOKEN_PATTERN.finditer(time_str):
+        value, unit = match.groups()
+        total_seconds += float(value) * _TIME_UNIT_SECONDS[unit[0]]
 
     # If just a number, assume seconds
     if total_seconds == 0:
@@ -101,10 +177,13 @@ def validate_video_file(file_path: Path) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if not file_path.exists():
+    # Single stat call for existence, type and size
+    try:
+        file_stat = file_path.stat()
+    except OSError:
         return False, "File does not exist"
 
-    if not file_path.is_file():
+    if not stat.S_ISREG(file_stat.st_mode):
         return False, "Path is not a file"
 
     # Check file extension
@@ -113,7 +192,7 @@ def validate_video_file(file_path: Path) -> Tuple[bool, Optional[str]]:
         return False, f"Invalid file format. Allowed: {', '.join(allowed_extensions)}"
 
     # Check file size
-    file_size = file_path.stat().st_size
+    file_size = file_stat.st_size
     max_size = 500 * 1024 * 1024  # 500MB
     if file_size > max_size:
         return False, f"File too large. Max size: {max_size / (1024*1024):.0f}MB"
@@ -121,6 +200,7 @@ def validate_video_file(file_path: Path) -> Tuple[bool, Optional[str]]:
     return True, None
 
 
+@lru_cache(maxsize=1024)
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize filename to remove dangerous characters.
@@ -135,12 +215,38 @@ def sanitize_filename(filename: str) -> str:
     filename = Path(filename).name
 
     # Replace spaces and special characters
-    filename = re.sub(r'[^\w\s.-]', '', filename)
-    filename = re.sub(r'\s+', '_', filename)
+    filename = _UNSAFE_FILENAME_CHARS.sub('', filename)
+    filename = _FILENAME_WHITESPACE.sub('_', filename)
 
     return filename
 
 
+def fingerprint_file(file_path: Path, sample_size: int = 4 * 1024 * 1024) -> str:
+    """
+    Compute a fast content fingerprint from the file size and its first/last bytes.
+
+    Only the head and tail are hashed (blake2b), so equal fingerprints mean
+    "probably identical"; compare full contents before relying on a match.
+
+    Args:
+        file_path: Path to file
+        sample_size: Bytes hashed from each end of the file
+
+    Returns:
+        Hex digest string
+    """
+    size = file_path.stat().st_size
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+
+    with open(file_path, 'rb') as f:
+        digest.update(f.read(sample_size))
+        if size > sample_size:
+            f.seek(max(sample_size, size - sample_size))
+            digest.update(f.read(sample_size))
+
+    return digest.hexdigest()
+
+
 def format_file_size(size_bytes: int) -> str:
     """
     Format file size in human-readable format.
@@ -179,6 +285,7 @@ def hex_to_rgb(hex_color: str) -> Optional[Tuple[int, int, int]]:
         return None
 
 
+@lru_cache(maxsize=1024)
 def color_name_to_hex(color_name: str) -> str:
     """
     Convert color name to hex value.
@@ -189,21 +296,4 @@ def color_name_to_hex(color_name: str) -> str:
     Returns:
         Hex color string
     """
-    color_map = {
-        'white': '#FFFFFF',
-        'black': '#000000',
-        'red': '#FF0000',
-        'green': '#00FF00',
-        'blue': '#0000FF',
-        'yellow': '#FFFF00',
-        'cyan': '#00FFFF',
-        'magenta': '#FF00FF',
-        'orange': '#FFA500',
-        'purple': '#800080',
-        'pink': '#FFC0CB',
-        'brown': '#A52A2A',
-        'gray': '#808080',
-        'grey': '#808080',
-    }
-
-    return color_map.get(color_name.lower(), '#FFFFFF')
+    return _COLOR_MAP.get(color_name.lower(), '#FFFFFF')
@@ -0,0 +1,61 @@
+"""
+Queue-based logging setup.
+
+Log records are put on an in-memory queue by the calling thread and written
+to the real handlers by a background listener thread, so request handlers
+never block on stdio.
+"""
+
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import List, Optional
+
+_LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+_original_handlers: List[logging.Handler] = []
+
+
+def start_queued_logging(level: int = logging.INFO) -> None:
+    """
+    Route root-logger records through a queue to a background writer thread.
+
+    Existing root handlers are moved behind the queue; a stderr handler is
+    used if none are configured.
+
+    Args:
+        level: Root logger level
+    """
+    global _listener, _original_handlers
+
+    if _listener is not None:
+        return
+
+    root = logging.getLogger()
+    _original_handlers = root.handlers[:]
+
+    handlers = _original_handlers
+    if not handlers:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+        handlers = [stream_handler]
+
+    queue: SimpleQueue = SimpleQueue()
+    root.handlers = [QueueHandler(queue)]
+    root.setLevel(level)
+
+    _listener = QueueListener(queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_queued_logging() -> None:
+    """Flush queued records and restore the original root handlers."""
+    global _listener
+
+    if _listener is None:
+        return
+
+    _listener.stop()
+    _listener = None
+    logging.getLogger().handlers = _original_handlers
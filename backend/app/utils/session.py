@@ -3,22 +3,49 @@ Session management for video editing sessions.
 In-memory storage with TTL support.
 """
 
+import logging
 import uuid
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Any
 from pathlib import Path
 
 from app.models.schemas import VideoSession, Subtitle, ChatMessage
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+# Number of independently locked session shards
+SESSION_SHARDS = 16
+
+
+class _SessionShard:
+    """One lock-protected slice of the session tables."""
+
+    __slots__ = ("lock", "sessions", "chat_history", "timestamps", "exports")
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.sessions: Dict[str, VideoSession] = {}
+        self.chat_history: Dict[str, List[ChatMessage]] = {}
+        # Last access per session, least recently used first
+        self.timestamps: "OrderedDict[str, datetime]" = OrderedDict()
+        self.exports: Dict[str, List[Dict[str, Any]]] = {}
+
 
 class SessionManager:
     """Manages video editing sessions with TTL support."""
 
     def __init__(self):
-        self._sessions: Dict[str, VideoSession] = {}
-        self._chat_history: Dict[str, List[ChatMessage]] = {}
-        self._session_timestamps: Dict[str, datetime] = {}
+        # Sessions are spread over shards so requests for different sessions
+        # don't contend on a single lock
+        self._shards = [_SessionShard() for _ in range(SESSION_SHARDS)]
+
+    def _shard(self, session_id: str) -> _SessionShard:
+        """Get the shard holding a session."""
+        return self._shards[hash(session_id) % SESSION_SHARDS]
 
     def create_session(
         self,
@@ -36,9 +63,12 @@ class SessionManager:
             created_at=datetime.now()
         )
 
-        self._sessions[session_id] = session
-        self._chat_history[session_id] = []
-        self._session_timestamps[session_id] = datetime.now()
+        shard = self._shard(session_id)
+        with shard.lock:
+            shard.sessions[session_id] = session
+            shard.chat_history[session_id] = []
+            shard.timestamps[session_id] = datetime.now()
+            shard.exports[session_id] = []
 
         return session
 
@@ -46,13 +76,17 @@ class SessionManager:
         """Get session by ID, returns None if not found or expired."""
         self._cleanup_expired_sessions()
 
-        if session_id not in self._sessions:
-            return None
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = shard.sessions.get(session_id)
+            if session is None:
+                return None
 
-        # Update last access timestamp
-        self._session_timestamps[session_id] = datetime.now()
+            # Update last access timestamp (most recent moves to the end)
+            shard.timestamps[session_id] = datetime.now()
+            shard.timestamps.move_to_end(session_id)
 
-        return self._sessions[session_id]
+        return session
 
     def update_subtitles(
         self,
@@ -64,7 +98,8 @@ class SessionManager:
         if not session:
             return False
 
-        session.subtitles = subtitles
+        with self._shard(session_id).lock:
+            session.subtitles = subtitles
         return True
 
     def add_subtitle(
@@ -77,7 +112,8 @@ class SessionManager:
         if not session:
             return False
 
-        session.subtitles.append(subtitle)
+        with self._shard(session_id).lock:
+            session.subtitles.append(subtitle)
         return True
 
     def get_subtitles(self, session_id: str) -> Optional[List[Subtitle]]:
@@ -94,56 +130,122 @@ class SessionManager:
         message: ChatMessage
     ) -> bool:
         """Add a chat message to session history."""
-        if session_id not in self._chat_history:
-            return False
+        shard = self._shard(session_id)
+        with shard.lock:
+            history = shard.chat_history.get(session_id)
+            if history is None:
+                return False
 
-        self._chat_history[session_id].append(message)
+            history.append(message)
+        return True
+
+    def add_chat_messages(
+        self,
+        session_id: str,
+        messages: List[ChatMessage]
+    ) -> bool:
+        """Add several chat messages (e.g. a user/AI turn) to session history."""
+        shard = self._shard(session_id)
+        with shard.lock:
+            history = shard.chat_history.get(session_id)
+            if history is None:
+                return False
+
+            history.extend(messages)
         return True
 
     def get_chat_history(self, session_id: str) -> List[ChatMessage]:
         """Get chat history for a session."""
-        return self._chat_history.get(session_id, [])
+        shard = self._shard(session_id)
+        with shard.lock:
+            return shard.chat_history.get(session_id, [])
+
+    def add_export(
+        self,
+        session_id: str,
+        filename: str,
+        size: int
+    ) -> bool:
+        """Record an exported file for a session."""
+        shard = self._shard(session_id)
+        with shard.lock:
+            exports = shard.exports.get(session_id)
+            if exports is None:
+                return False
+
+            exports.append({
+                "filename": filename,
+                "size": size,
+                "download_url": f"/outputs/{filename}"
+            })
+        return True
+
+    def get_exports(self, session_id: str) -> List[Dict[str, Any]]:
+        """Get exported files recorded for a session."""
+        shard = self._shard(session_id)
+        with shard.lock:
+            return list(shard.exports.get(session_id, []))
 
     def delete_session(self, session_id: str) -> bool:
         """Delete a session and its associated data."""
-        if session_id not in self._sessions:
+        shard = self._shard(session_id)
+        with shard.lock:
+            session = self._remove_from_shard(shard, session_id)
+        if session is None:
             return False
 
-        # Get video path for cleanup
-        session = self._sessions[session_id]
-
-        # Delete session data
-        del self._sessions[session_id]
-        del self._chat_history[session_id]
-        del self._session_timestamps[session_id]
+        self._delete_video_file(session)
+        return True
 
+    def _delete_video_file(self, session: VideoSession) -> None:
+        """Delete a session's uploaded video file."""
         # Clean up files (optional - can be done async)
         try:
             video_path = Path(session.video_path)
             if video_path.exists():
                 video_path.unlink()
         except Exception as e:
-            print(f"Error deleting video file: {e}")
-
-        return True
+            logger.warning("Error deleting video file: %s", e)
+
+    def _remove_from_shard(self, shard: _SessionShard, session_id: str) -> Optional[VideoSession]:
+        """Drop a session's data from its shard. Caller must hold the shard lock."""
+        session = shard.sessions.pop(session_id, None)
+        shard.chat_history.pop(session_id, None)
+        shard.timestamps.pop(session_id, None)
+        shard.exports.pop(session_id, None)
+        return session
 
     def _cleanup_expired_sessions(self):
         """Remove expired sessions based on TTL."""
         now = datetime.now()
-        expired_sessions = []
-
-        for session_id, timestamp in self._session_timestamps.items():
-            if now - timestamp > timedelta(seconds=settings.session_ttl):
-                expired_sessions.append(session_id)
-
-        for session_id in expired_sessions:
-            print(f"Cleaning up expired session: {session_id}")
-            self.delete_session(session_id)
+        ttl = timedelta(seconds=settings.session_ttl)
+
+        for shard in self._shards:
+            # Collect expired sessions holding only this shard's lock;
+            # timestamps are in access order, so only the expired head is visited
+            expired_sessions = []
+            with shard.lock:
+                while shard.timestamps:
+                    session_id, timestamp = next(iter(shard.timestamps.items()))
+                    if now - timestamp <= ttl:
+                        break
+                    expired_sessions.append(self._remove_from_shard(shard, session_id))
+
+            # Delete files outside the lock
+            for session in expired_sessions:
+                if session is None:
+                    continue
+                logger.info("Cleaning up expired session: %s", session.session_id)
+                self._delete_video_file(session)
 
     def get_all_sessions(self) -> Dict[str, VideoSession]:
         """Get all active sessions (for debugging)."""
         self._cleanup_expired_sessions()
-        return self._sessions.copy()
+        sessions: Dict[str, VideoSession] = {}
+        for shard in self._shards:
+            with shard.lock:
+                sessions.update(shard.sessions)
+        return sessions
 
     def session_exists(self, session_id: str) -> bool:
         """Check if session exists and is not expired."""
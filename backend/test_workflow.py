@@ -8,10 +8,20 @@ import time
 import sys
 from pathlib import Path
 
+# Optional: stream multipart uploads from disk instead of building the body in memory
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+    TOOLBELT_AVAILABLE = True
+except ImportError:
+    TOOLBELT_AVAILABLE = False
+
 # Configuration
 BASE_URL = "http://localhost:8000"
 API_URL = f"{BASE_URL}/api"
 
+# Shared HTTP session so all requests reuse one keep-alive connection
+SESSION = requests.Session()
+
 # Colors for terminal output
 GREEN = '\033[92m'
 RED = '\033[91m'
@@ -43,7 +53,7 @@ def test_health_check():
     print("="*60)
 
     try:
-        response = requests.get(f"{API_URL}/health")
+        response = SESSION.get(f"{API_URL}/health")
         response.raise_for_status()
         data = response.json()
 
@@ -76,8 +86,17 @@ def test_video_upload(video_path: str = None):
 
     try:
         with open(video_file, 'rb') as f:
-            files = {'file': (video_file.name, f, 'video/mp4')}
-            response = requests.post(f"{API_URL}/upload", files=files)
+            if TOOLBELT_AVAILABLE:
+                # Body is read from the file in chunks while sending
+                encoder = MultipartEncoder(fields={'file': (video_file.name, f, 'video/mp4')})
+                response = SESSION.post(
+                    f"{API_URL}/upload",
+                    data=encoder,
+                    headers={'Content-Type': encoder.content_type}
+                )
+            else:
+                files = {'file': (video_file.name, f, 'video/mp4')}
+                response = SESSION.post(f"{API_URL}/upload", files=files)
             response.raise_for_status()
 
         data = response.json()
@@ -116,7 +135,7 @@ def test_chat_subtitle_addition(session_id: str):
         print(f"\n{BLUE}Message {i}:{RESET} {message}")
 
         try:
-            response = requests.post(
+            response = SESSION.post(
                 f"{API_URL}/chat",
                 json={
                     "session_id": session_id,
@@ -153,7 +172,7 @@ def test_get_subtitles(session_id: str):
         return False
 
     try:
-        response = requests.get(f"{API_URL}/subtitles/{session_id}")
+        response = SESSION.get(f"{API_URL}/subtitles/{session_id}")
         response.raise_for_status()
         subtitles = response.json()
 
@@ -187,7 +206,7 @@ def test_export_video(session_id: str):
         print_info("Exporting video with burned subtitles...")
         print_warning("This may take a while depending on video length...")
 
-        response = requests.post(
+        response = SESSION.post(
             f"{API_URL}/export",
             json={
                 "session_id": session_id,
@@ -195,8 +214,22 @@ def test_export_video(session_id: str):
             }
         )
         response.raise_for_status()
-        data = response.json()
+        job = response.json()
+
+        # Export runs as a background job; poll until it finishes
+        print_info(f"Export job queued: {job['job_id']}")
+        while job['status'] not in ("completed", "failed"):
+            time.sleep(1)
+            response = SESSION.get(f"{BASE_URL}{job['status_url']}")
+            response.raise_for_status()
+            job = response.json()
+            print_info(f"Progress: {job['progress']:.0f}%")
+
+        if job['status'] == "failed":
+            print_error(f"Export failed: {job['error']}")
+            return False
 
+        data = job['result']
         download_url = f"{BASE_URL}{data['download_url']}"
 
         print_success(f"Video exported successfully")
@@ -222,7 +255,7 @@ def test_chat_history(session_id: str):
         return False
 
     try:
-        response = requests.get(f"{API_URL}/chat/history/{session_id}")
+        response = SESSION.get(f"{API_URL}/chat/history/{session_id}")
         response.raise_for_status()
         data = response.json()
 
@@ -26,6 +26,7 @@ function App() {
   const [isShowingPreview, setIsShowingPreview] = useState(false);
   const [silenceData, setSilenceData] = useState(null);
   const [showSilenceRemoval, setShowSilenceRemoval] = useState(false);
+  const [chatStatus, setChatStatus] = useState(null);
 
   // Handle video upload success
   const handleUploadSuccess = (videoData) => {
@@ -80,7 +81,9 @@ function App() {
       const response = await sendChatMessage(
         session.sessionId,
         message,
-        session.videoId
+        session.videoId,
+        null,
+        setChatStatus
       );
 
       console.log('API Response:', response);
@@ -120,6 +123,7 @@ function App() {
       setError(error.message);
     } finally {
       setProcessing(false);
+      setChatStatus(null);
     }
   };
 
@@ -319,6 +323,7 @@ function App() {
             messages={session.chatHistory}
             onSendMessage={handleSendMessage}
             isProcessing={session.isProcessing}
+            statusText={chatStatus}
             disabled={!session.videoId}
           />
         </div>
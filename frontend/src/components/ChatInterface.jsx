@@ -7,6 +7,7 @@ const ChatInterface = ({
   messages = [],
   onSendMessage,
   isProcessing = false,
+  statusText = null,
   disabled = false
 }) => {
   const [inputValue, setInputValue] = useState('');
@@ -129,10 +130,13 @@ const ChatInterface = ({
                   </svg>
                 </div>
                 <div className="flex-1">
-                  <div className="flex gap-1 p-3">
+                  <div className="flex items-center gap-1 p-3">
                     <span className="w-2 h-2 bg-secondary rounded-full animate-typing"></span>
                     <span className="w-2 h-2 bg-secondary rounded-full animate-typing [animation-delay:0.2s]"></span>
                     <span className="w-2 h-2 bg-secondary rounded-full animate-typing [animation-delay:0.4s]"></span>
+                    {statusText && (
+                      <span className="ml-2 text-sm text-gray-500">{statusText}</span>
+                    )}
                   </div>
                 </div>
               </div>
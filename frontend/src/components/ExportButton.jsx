@@ -26,9 +26,9 @@ const ExportButton = ({ sessionId, videoId, disabled = false, onExportSuccess, p
       } else {
         // Generate export first
         setExportProgress('Preparing export...');
-        response = await exportVideo(sessionId);
-
-        setExportProgress('Processing video...');
+        response = await exportVideo(sessionId, null, (progress) => {
+          setExportProgress(`Processing video... ${Math.round(progress)}%`);
+        });
 
         if (!response.download_url && !response.downloadUrl) {
           throw new Error('No download URL received from server');
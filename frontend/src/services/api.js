@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { API_BASE_URL, API_ENDPOINTS } from '../utils/constants';
+import { API_BASE_URL, API_ENDPOINTS, JOB_POLL_INTERVAL } from '../utils/constants';
 
 // Create axios instance with base configuration
 const apiClient = axios.create({
@@ -74,25 +74,124 @@ export const uploadVideo = async (file, onProgress) => {
   }
 };
 
+/**
+ * Parse one Server-Sent Events frame into { event, data }
+ * @param {string} frame - Raw frame text (without the trailing blank line)
+ * @returns {Object|null} Parsed event, or null for comment-only frames
+ */
+const parseSseFrame = (frame) => {
+  let event = 'message';
+  const dataLines = [];
+
+  for (const line of frame.split('\n')) {
+    if (line.startsWith('event:')) {
+      event = line.slice(6).trim();
+    } else if (line.startsWith('data:')) {
+      dataLines.push(line.slice(5).trim());
+    }
+  }
+
+  if (dataLines.length === 0) {
+    return null;
+  }
+  return { event, data: JSON.parse(dataLines.join('\n')) };
+};
+
 /**
  * Send chat message/prompt
+ * Streams the turn over Server-Sent Events so response text can be shown
+ * as soon as the server produces it.
  * @param {string} sessionId - Video session ID
  * @param {string} message - User message/prompt
  * @param {string} videoId - Video ID (optional, for backward compatibility)
+ * @param {Function} onDelta - Optional callback receiving response text chunks
+ * @param {Function} onStatus - Optional callback receiving progress text (e.g. "Applying changes...")
  * @returns {Promise} Chat response
  */
-export const sendChatMessage = async (sessionId, message, videoId) => {
+export const sendChatMessage = async (sessionId, message, videoId, onDelta = null, onStatus = null) => {
+  let response;
   try {
-    const response = await apiClient.post(API_ENDPOINTS.CHAT, {
-      session_id: sessionId,
-      message: message,
+    response = await fetch(`${API_BASE_URL}${API_ENDPOINTS.CHAT_STREAM}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        session_id: sessionId,
+        message: message,
+      }),
     });
-
-    return response.data;
   } catch (error) {
-    throw new Error(
-      error.response?.data?.detail || error.response?.data?.message || 'Failed to process message'
-    );
+    throw new Error('Failed to process message');
+  }
+
+  // Session/configuration errors are returned before the stream starts
+  if (!response.ok) {
+    const errorData = await response.json().catch(() => ({}));
+    throw new Error(errorData.detail || errorData.message || 'Failed to process message');
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) {
+      break;
+    }
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const frame = parseSseFrame(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+      if (!frame) {
+        continue;
+      }
+
+      if (frame.event === 'done') {
+        return frame.data;
+      }
+      if (frame.event === 'error') {
+        throw new Error(frame.data.detail || 'Failed to process message');
+      }
+      if (frame.event === 'status') {
+        if (onStatus) {
+          onStatus(frame.data.status);
+        }
+        continue;
+      }
+      if (frame.data.delta && onDelta) {
+        onDelta(frame.data.delta);
+      }
+    }
+  }
+
+  throw new Error('Failed to process message');
+};
+
+/**
+ * Poll a background job until it completes or fails
+ * @param {string} jobId - Job ID returned by the server
+ * @param {Function} onProgress - Optional progress callback (0-100)
+ * @returns {Promise} Job result
+ */
+export const waitForJob = async (jobId, onProgress) => {
+  while (true) {
+    const response = await apiClient.get(`${API_ENDPOINTS.JOBS}/${jobId}`);
+    const job = response.data;
+
+    if (onProgress) {
+      onProgress(job.progress);
+    }
+
+    if (job.status === 'completed') {
+      return job.result;
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Job failed');
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL));
   }
 };
 
@@ -100,19 +199,20 @@ export const sendChatMessage = async (sessionId, message, videoId) => {
  * Export video with burned subtitles
  * @param {string} sessionId - Video session ID
  * @param {string} filename - Optional output filename
+ * @param {Function} onProgress - Optional progress callback (0-100)
  * @returns {Promise} Export response with download URL
  */
-export const exportVideo = async (sessionId, filename = null) => {
+export const exportVideo = async (sessionId, filename = null, onProgress = null) => {
   try {
     const response = await apiClient.post(API_ENDPOINTS.EXPORT, {
       session_id: sessionId,
       filename: filename,
     });
 
-    return response.data;
+    return await waitForJob(response.data.job_id, onProgress);
   } catch (error) {
     throw new Error(
-      error.response?.data?.detail || error.response?.data?.message || 'Failed to export video'
+      error.response?.data?.detail || error.response?.data?.message || error.message || 'Failed to export video'
     );
   }
 };
@@ -5,10 +5,15 @@ export const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localho
 export const API_ENDPOINTS = {
   UPLOAD: '/api/upload',
   CHAT: '/api/chat',
+  CHAT_STREAM: '/api/chat/stream',
   EXPORT: '/api/export',
   PREVIEW: '/api/preview',
+  JOBS: '/api/jobs',
 };
 
+// Interval between background job status polls (ms)
+export const JOB_POLL_INTERVAL = 1000;
+
 // Supported video formats
 export const SUPPORTED_VIDEO_FORMATS = [
   'video/mp4',